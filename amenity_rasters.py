@@ -0,0 +1,73 @@
+import math
+import numpy as np
+from constants import *
+
+
+def disk_sum(grids, radius):
+    """Sum of each [..., y, x] grid over the tiles within radius of every tile, clipped at the edges"""
+    height, width = grids.shape[-2:]
+    # Row prefix sums, padded so every run below is a plain slice: zeros on
+    # the left and the row total repeated on the right.
+    prefix = np.zeros(grids.shape[:-1] + (width + 1 + 2 * radius,), dtype=np.int64)
+    np.cumsum(grids, axis=-1, out=prefix[..., radius + 1:radius + 1 + width])
+    prefix[..., radius + 1 + width:] = prefix[..., radius + width:radius + 1 + width]
+
+    # A disk is a stack of horizontal runs, and a run is a difference of prefix sums
+    total = np.zeros(grids.shape, dtype=np.int64)
+    for dy in range(-radius, radius + 1):
+        if abs(dy) >= height:
+            continue
+        half = math.isqrt(radius * radius - dy * dy)
+        runs = (prefix[..., radius + half + 1:radius + half + 1 + width]
+                - prefix[..., radius - half:radius - half + width])
+        if dy >= 0:
+            total[..., :height - dy, :] += runs[..., dy:, :]
+        else:
+            total[..., -dy:, :] += runs[..., :height + dy, :]
+    return total
+
+
+class AmenityRasters:
+    """Per-tile counts of the amenities within reach of each tile, one raster per amenity.
+
+    A tile's count for an amenity is how many of its sources have their centre
+    tile within radius tiles (centre to centre). Sources are stamped in and
+    out as they are added and removed, so reading a tile is one array lookup."""
+
+    def __init__(self, terrain, amenities=AMENITY_TYPES, radius=AMENITY_RADIUS):
+        self.terrain = terrain
+        self.amenities = tuple(amenities)
+        self.radius = radius
+        offsets = np.arange(-radius, radius + 1)
+        self.disk = (offsets[None, :] ** 2 + offsets[:, None] ** 2 <= radius * radius).astype(np.int16)
+        self.reset()
+
+    def reset(self):
+        shape = self.terrain.terrain_types.shape
+        self.rasters = {amenity: np.zeros(shape, dtype=np.int16) for amenity in self.amenities}
+
+    def stamp(self, amenity, cell, delta):
+        """Add delta to every tile within radius of cell"""
+        raster = self.rasters[amenity]
+        height, width = raster.shape
+        x, y = cell
+        r = self.radius
+        left, right = max(0, x - r), min(width, x + r + 1)
+        top, bottom = max(0, y - r), min(height, y + r + 1)
+        if left >= right or top >= bottom:
+            return
+        raster[top:bottom, left:right] += delta * self.disk[top - y + r:bottom - y + r, left - x + r:right - x + r]
+
+    def add(self, amenity, cell):
+        self.stamp(amenity, cell, 1)
+
+    def remove(self, amenity, cell):
+        self.stamp(amenity, cell, -1)
+
+    def count(self, amenity, cell):
+        return int(self.rasters[amenity][cell[1], cell[0]])
+
+    def near(self, amenity, world_pos):
+        """True if any amenity of this kind covers the tile under world_pos"""
+        grid_x, grid_y = self.terrain.world_to_grid(world_pos)
+        return self.rasters[amenity][grid_y, grid_x] > 0
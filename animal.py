@@ -11,22 +11,15 @@ class Animal(pygame.sprite.Sprite):
 
         config = animal_manager.species_config[species]
 
-        width = int(config['scale'][0] * TILE_SIZE)
-        height = int(config['scale'][1] * TILE_SIZE)
-
-        self.base_image = pygame.Surface((width, height), pygame.SRCALPHA)
-        self.base_image.fill(animal_manager.species_colors[species])
-
-        pygame.draw.circle(self.base_image, BLACK,
-                           (int(width * 0.7), int(height * 0.5)),
-                           int(width * 0.15))
-
-        self.image = self.base_image.copy()
-        self.rect = self.image.get_rect()
+        # Sprites are shared per species; an animal only remembers its frame
+        self.atlas = animal_manager.atlases[species]
+        self.frame = self.atlas.upright
+        self.rect = self.atlas.base_image.get_rect()
         self.rect.center = position
 
         self.species = species
         self.position = position
+        self.previous_position = position
         self.terrain = terrain
         self.manager = animal_manager
         self.game_state = animal_manager.game_state
@@ -47,6 +40,8 @@ class Animal(pygame.sprite.Sprite):
         self.need_threshold = 70
 
         self.rotation = 0
+        self.pending_move = None
+        self.lod_elapsed = 0.0
 
         self.need_rate = self.game_state.difficulty_settings["animal_need_rate"]
 
@@ -70,6 +65,13 @@ class Animal(pygame.sprite.Sprite):
 
     def step(self, dt):
         """Update animal state and perform actions"""
+        self.previous_position = self.position
+        self.update_needs(dt)
+        self.decide_action()
+        self.act(dt)
+
+    def update_needs(self, dt):
+        """Advance hunger, thirst, energy and health by dt"""
         self.hunger += 0.5 * dt * self.need_rate
         self.thirst += 0.7 * dt * self.need_rate
         self.energy -= 0.3 * dt
@@ -83,8 +85,8 @@ class Animal(pygame.sprite.Sprite):
         else:
             self.health = min(100, self.health + 0.1 * dt)
 
-        self.decide_action()
-
+    def act(self, dt):
+        """Carry out the current state's action"""
         if self.state == "seeking_food":
             self.seek_food(dt)
         elif self.state == "seeking_water":
@@ -118,86 +120,55 @@ class Animal(pygame.sprite.Sprite):
 
     def seek_food(self, dt):
         """Seek out food sources"""
-        if not self.is_feeding_station(self.target):
-            feeding_stations = [b for b in self.manager.buildings.buildings
-                                if b.building_type == "feeding_station"]
-
-            if feeding_stations:
-                closest = min(feeding_stations, key=lambda b: distance(self.position, b.position))
-                self.target = closest
-                self.target_position = closest.position
-            else:
-                grass_locations = self.find_grass_locations()
-                if grass_locations:
-                    self.target_position = random.choice(grass_locations)
-                else:
-                    self.state = "idle"
-                    return
-
-        if self.target_position:
-            self.move_to_target(dt)
+        fields = self.manager.buildings.resource_fields
+        kind = "feeding_station" if fields.has_sources("feeding_station") else "grass"
 
-            if distance(self.position, self.target_position) < TILE_SIZE * 2:
-                self.hunger = max(0, self.hunger - 30)
-                self.state = "idle"
-                self.target = None
-                self.target_position = None
-
-    @staticmethod
-    def is_water_station(target):
-        try:
-            return getattr(target, "building_type", None) == "water_station" or \
-                (isinstance(target, dict) and target.get("building_type") == "water_station")
-        except:
-            return False
+        if not self.follow_field(kind, dt):
+            self.state = "idle"
+            return
 
-    @staticmethod
-    def is_feeding_station(target):
-        try:
-            return getattr(target, "building_type", None) == "feeding_station" or \
-                (isinstance(target, dict) and target.get("building_type") == "feeding_station")
-        except:
-            return False
+        if fields.distance_at(kind, self.position) == 0:
+            self.hunger = max(0, self.hunger - 30)
+            self.state = "idle"
+            self.target = None
+            self.target_position = None
 
     def seek_water(self, dt):
         """Seek out water sources"""
-        if not self.is_water_station(self.target):
-            water_stations = [b for b in self.manager.buildings.buildings
-                              if b.building_type == "water_station"]
-
-            if water_stations:
-                closest = min(water_stations, key=lambda b: distance(self.position, b.position))
-                self.target = closest
-                self.target_position = closest.position
-            # else:
-            #     water_locations = self.find_water_locations()
-            #     if water_locations:
-            #         self.target_position = random.choice(water_locations)
-            #         self.target = {'position': self.target_position, 'building_type': 'natural_water'}
-            # new logic to block land animals from going into water
-            else:
-                if self.species in ["crocodile"]:  # Add hippo later if needed
-                    water_locations = self.find_water_locations()
-                    if water_locations:
-                        self.target_position = random.choice(water_locations)
-                        self.target = {'position': self.target_position, 'building_type': 'natural_water'}
-                else:
-                    self.state = "idle"  # Stay still if no water station available
-                    self.game_state.add_notification(
-                        f"{self.species.capitalize()} is thirsty but found no water station.")
-                    return
-
-        if self.target_position:
-            blocked = not self.move_to_target(dt)
-
-            if not blocked and distance(self.position, self.target_position) < TILE_SIZE * 2:
-                self.thirst = max(0, self.thirst - 40)
-                self.state = "idle"
-                self.target = None
-                self.target_position = None
-            elif blocked:
-                self.target_position = None
-                self.target = None
+        fields = self.manager.buildings.resource_fields
+
+        if fields.has_sources("water_station"):
+            kind = "water_station"
+        # block land animals from going into natural water
+        elif self.species in ["crocodile"]:  # Add hippo later if needed
+            kind = "water"
+        else:
+            self.state = "idle"  # Stay still if no water station available
+            self.game_state.add_notification(
+                f"{self.species.capitalize()} is thirsty but found no water station.")
+            return
+
+        if not self.follow_field(kind, dt):
+            self.target_position = None
+            self.target = None
+            return
+
+        if fields.distance_at(kind, self.position) == 0:
+            self.thirst = max(0, self.thirst - 40)
+            self.state = "idle"
+            self.target = None
+            self.target_position = None
+
+    def follow_field(self, kind, dt):
+        """Take one step along the resource field towards the nearest source"""
+        step = self.manager.buildings.resource_fields.next_step(kind, self.position)
+        if step is None:
+            return False
+
+        self.target = None
+        self.target_position = step
+        self.move_to_target(dt)
+        return True
 
     def rest(self, dt):
         """Rest to regain energy"""
@@ -253,44 +224,31 @@ class Animal(pygame.sprite.Sprite):
         move_y = direction_y * speed
         new_pos = (self.position[0] + move_x, self.position[1] + move_y)
 
-        if (self.terrain.is_water_at_position(new_pos) and
-                self.species != "crocodile" and
-                self.state != "seeking_water"):
-            return False
-
-        self.position = new_pos
-        self.rect.center = self.position
-        self.rotation = math.degrees(math.atan2(direction_y, direction_x))
-        self.image = pygame.transform.rotate(self.base_image, -self.rotation + 90)
+        # The water check for every animal is done in one batch by the manager
+        may_enter_water = self.species == "crocodile" or self.state == "seeking_water"
+        self.pending_move = (new_pos, may_enter_water, math.degrees(math.atan2(direction_y, direction_x)))
 
         return True
 
-    def find_grass_locations(self):
-        """Find suitable grass locations for food"""
-        grass_locations = []
-
-        search_radius = 20 * TILE_SIZE
-        step = 5 * TILE_SIZE
-
-        for x_offset in range(-int(search_radius), int(search_radius) + 1, int(step)):
-            for y_offset in range(-int(search_radius), int(search_radius) + 1, int(step)):
-                pos = (self.position[0] + x_offset, self.position[1] + y_offset)
-                if self.terrain.get_terrain_at_position(pos) == "grass":
-                    grass_locations.append(pos)
+    def apply_move(self, into_water):
+        """Commit the move proposed by move_to_target unless it would wade into water"""
+        new_pos, may_enter_water, rotation = self.pending_move
+        self.pending_move = None
 
-        return grass_locations
+        if into_water and not may_enter_water:
+            return False
 
-    def find_water_locations(self):
-        """Find suitable water locations for drinking"""
-        water_locations = []
+        self.position = new_pos
+        self.rect.center = self.position
+        self.rotation = rotation
+        self.frame = self.atlas.frame_index(rotation)
 
-        search_radius = 30 * TILE_SIZE
-        step = 5 * TILE_SIZE
+        return True
 
-        for x_offset in range(-int(search_radius), int(search_radius) + 1, int(step)):
-            for y_offset in range(-int(search_radius), int(search_radius) + 1, int(step)):
-                pos = (self.position[0] + x_offset, self.position[1] + y_offset)
-                if self.terrain.is_water_at_position(pos):
-                    water_locations.append(pos)
+    @property
+    def image(self):
+        return self.atlas.frame(self.frame)
 
-        return water_locations
\ No newline at end of file
+    @property
+    def base_image(self):
+        return self.atlas.base_image
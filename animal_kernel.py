@@ -0,0 +1,368 @@
+import numpy as np
+from animal import Animal
+from constants import *
+
+ANIMAL_STATES = ("idle", "seeking_food", "seeking_water", "resting")
+ANIMAL_IDLE, ANIMAL_SEEKING_FOOD, ANIMAL_SEEKING_WATER, ANIMAL_RESTING = range(len(ANIMAL_STATES))
+
+# Per-animal columns of the kernel and their dtypes
+SCALAR_FIELDS = {
+    "hunger": np.float64,
+    "thirst": np.float64,
+    "health": np.float64,
+    "energy": np.float64,
+    "speed": np.float64,
+    "age": np.float64,
+    "need_rate": np.float64,
+    "need_threshold": np.float64,
+    "wander_timer": np.float64,
+    "rotation": np.float64,
+    "wandering": np.bool_,
+    "has_target": np.bool_,
+    "has_group_center": np.bool_,
+    "state": np.int8,
+    "frame": np.int16,
+    "species_code": np.int16,
+    "group_id": np.int64,
+    "lod_elapsed": np.float64,
+    "cell_x": np.int64,
+    "cell_y": np.int64,
+}
+VECTOR_FIELDS = ("position", "previous_position", "target_position", "group_center")
+
+
+class AnimalKernel:
+    """Structure-of-arrays store that advances every animal per tick with vectorized operations"""
+
+    def __init__(self, animal_manager, capacity=64):
+        self.manager = animal_manager
+        self.terrain = animal_manager.terrain
+        self.game_state = animal_manager.game_state
+        self.species_names = list(animal_manager.species_config)
+        self.rotation_steps = np.array(
+            [animal_manager.atlases[species].steps for species in self.species_names], dtype=np.int64)
+        self.count = 0
+        self.capacity = 0
+        self.views = []
+        self.arrivals = {}
+        self.rng = np.random.default_rng()
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        """Reallocate every column with room for capacity animals"""
+        for name, dtype in SCALAR_FIELDS.items():
+            column = np.zeros(capacity, dtype=dtype)
+            if self.capacity:
+                column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+        for name in VECTOR_FIELDS:
+            column = np.zeros((capacity, 2), dtype=np.float64)
+            if self.capacity:
+                column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def allocate(self, view):
+        """Reserve the next free slot for an animal view"""
+        if self.count == self.capacity:
+            self.grow(self.capacity * 2)
+        slot = self.count
+        for name in (*SCALAR_FIELDS, *VECTOR_FIELDS):
+            getattr(self, name)[slot] = 0
+        self.count += 1
+        self.views.append(view)
+        return slot
+
+    def release(self, view):
+        """Free a view's slot by moving the last animal into it"""
+        slot = view.slot
+        last = self.count - 1
+        if slot != last:
+            for name in (*SCALAR_FIELDS, *VECTOR_FIELDS):
+                column = getattr(self, name)
+                column[slot] = column[last]
+            moved = self.views[last]
+            moved.slot = slot
+            self.views[slot] = moved
+        self.views.pop()
+        self.count = last
+        view.slot = None
+
+    def code_of(self, species):
+        return self.species_names.index(species) if species in self.species_names else -1
+
+    def step(self, dt):
+        """Advance needs, state and movement; return the views that died.
+
+        dt is either one value for every animal or an array with one value per
+        slot, where 0 skips that animal for this tick."""
+        n = self.count
+        if not n:
+            return []
+
+        dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), (n,))
+        active = dt > 0
+
+        self.previous_position[:n] = self.position[:n]
+        hunger = self.hunger[:n]
+        thirst = self.thirst[:n]
+        health = self.health[:n]
+        energy = self.energy[:n]
+        state = self.state[:n]
+        wandering = self.wandering[:n]
+
+        hunger += 0.5 * dt * self.need_rate[:n]
+        thirst += 0.7 * dt * self.need_rate[:n]
+        energy -= 0.3 * dt
+        np.minimum(hunger, 100, out=hunger)
+        np.minimum(thirst, 100, out=thirst)
+        np.minimum(energy, 100, out=energy)
+
+        starving = (hunger > 90) | (thirst > 90)
+        health[:] = np.where(starving, health - 0.5 * dt, np.minimum(100, health + 0.1 * dt))
+
+        self.decide_actions(n, active)
+        # Each animal acts on the state it decided on, even if an action changes it
+        acting = np.where(active, state, -1)
+
+        moving = np.zeros(n, dtype=bool)
+        self.seek(acting == ANIMAL_SEEKING_FOOD, ANIMAL_SEEKING_FOOD, moving)
+        self.seek(acting == ANIMAL_SEEKING_WATER, ANIMAL_SEEKING_WATER, moving)
+
+        resting = acting == ANIMAL_RESTING
+        wandering[resting] = False
+        energy[resting] += dt[resting]
+        state[resting & (energy > 80)] = ANIMAL_IDLE
+
+        idle = acting == ANIMAL_IDLE
+        self.start_wandering(idle & ~wandering)
+        moving |= idle & wandering
+
+        self.move(n, moving, dt)
+        self.check_arrivals(n, idle, dt)
+
+        return [self.views[slot] for slot in np.flatnonzero(health <= 0)]
+
+    def decide_actions(self, n, active):
+        """Vectorized Animal.decide_action for the active animals"""
+        hunger = self.hunger[:n]
+        thirst = self.thirst[:n]
+        weak = self.health[:n] < 20
+        needy = self.need_threshold[:n]
+        self.state[:n] = np.where(active, np.select(
+            [weak & (hunger > thirst), weak, self.energy[:n] < 20,
+             hunger > needy, thirst > needy, ~self.wandering[:n]],
+            [ANIMAL_SEEKING_FOOD, ANIMAL_SEEKING_WATER, ANIMAL_RESTING,
+             ANIMAL_SEEKING_FOOD, ANIMAL_SEEKING_WATER, ANIMAL_IDLE],
+            default=self.state[:n]), self.state[:n])
+
+    def seek(self, seeking, seeking_state, moving):
+        """Point every seeking animal one tile along its resource field"""
+        fields = self.manager.buildings.resource_fields
+        seekers = np.flatnonzero(seeking)
+        if not seekers.size:
+            return
+
+        if seeking_state == ANIMAL_SEEKING_FOOD:
+            kind = "feeding_station" if fields.has_sources("feeding_station") else "grass"
+        elif fields.has_sources("water_station"):
+            kind = "water_station"
+        else:
+            # Only crocodiles may drink from natural water
+            crocodile = self.species_code[seekers] == self.code_of("crocodile")
+            for code in np.unique(self.species_code[seekers[~crocodile]]):
+                self.game_state.add_notification(
+                    f"{self.species_names[code].capitalize()} is thirsty but found no water station.")
+            self.state[seekers[~crocodile]] = ANIMAL_IDLE
+            seekers = seekers[crocodile]
+            kind = "water"
+            if not seekers.size:
+                return
+
+        tiles = self.terrain.grid_indices_at(self.position[seekers])
+        steps = fields.next_tiles(kind, tiles)
+        lost = steps < 0
+        if seeking_state == ANIMAL_SEEKING_FOOD:
+            self.state[seekers[lost]] = ANIMAL_IDLE
+        else:
+            self.has_target[seekers[lost]] = False
+
+        seekers = seekers[~lost]
+        self.target_position[seekers] = self.terrain.grid_indices_to_world(steps[~lost])
+        self.has_target[seekers] = True
+        moving[seekers] = True
+        self.arrivals[seeking_state] = (kind, seekers)
+
+    def start_wandering(self, starting):
+        """Pick a fresh wander target near the group centre, or near the animal itself"""
+        slots = np.flatnonzero(starting)
+        if not slots.size:
+            return
+
+        in_group = self.has_group_center[slots]
+        jitter = np.where(in_group, TILE_SIZE * 3, 10 * TILE_SIZE)[:, None]
+        centre = np.where(in_group[:, None], self.group_center[slots], self.position[slots])
+        self.target_position[slots] = centre + self.rng.uniform(-1, 1, (slots.size, 2)) * jitter
+        self.has_target[slots] = True
+        self.wandering[slots] = True
+        self.wander_timer[slots] = self.rng.uniform(5, 15, slots.size)
+
+    def move(self, n, moving, dt):
+        """Step movers towards their targets, keeping land animals out of water"""
+        slots = np.flatnonzero(moving & self.has_target[:n])
+        if not slots.size:
+            return
+
+        direction = self.target_position[slots] - self.position[slots]
+        length = np.hypot(direction[:, 0], direction[:, 1])
+        slots = slots[length > 0]
+        direction = direction[length > 0] / length[length > 0, None]
+
+        new_positions = self.position[slots] + direction * (self.speed[slots] * dt[slots])[:, None]
+        allowed = ~self.terrain.is_water_batch(new_positions)
+        allowed |= self.species_code[slots] == self.code_of("crocodile")
+        allowed |= self.state[slots] == ANIMAL_SEEKING_WATER
+
+        slots = slots[allowed]
+        direction = direction[allowed]
+        self.position[slots] = new_positions[allowed]
+        self.rotation[slots] = np.degrees(np.arctan2(direction[:, 1], direction[:, 0]))
+        steps = self.rotation_steps[self.species_code[slots]]
+        self.frame[slots] = np.rint(self.rotation[slots] * steps / 360).astype(np.int64) % steps
+
+    def check_arrivals(self, n, idle, dt):
+        """Feed and water animals standing on a source, and end finished wanders"""
+        fields = self.manager.buildings.resource_fields
+        for seeking_state, (kind, seekers) in self.arrivals.items():
+            tiles = self.terrain.grid_indices_at(self.position[seekers])
+            arrived = seekers[fields.field(kind)["distance"][tiles] == 0]
+            if seeking_state == ANIMAL_SEEKING_FOOD:
+                self.hunger[arrived] = np.maximum(0, self.hunger[arrived] - 30)
+            else:
+                self.thirst[arrived] = np.maximum(0, self.thirst[arrived] - 40)
+            self.state[arrived] = ANIMAL_IDLE
+            self.has_target[arrived] = False
+        self.arrivals = {}
+
+        wanderers = np.flatnonzero(idle & self.wandering[:n])
+        self.wander_timer[wanderers] -= dt[wanderers]
+        offset = self.target_position[wanderers] - self.position[wanderers]
+        done = self.has_target[wanderers] & (
+            (np.hypot(offset[:, 0], offset[:, 1]) < TILE_SIZE) | (self.wander_timer[wanderers] <= 0))
+        done = wanderers[done]
+        self.wandering[done] = False
+        self.wander_timer[done] = self.rng.uniform(2, 5, done.size)
+
+    def update_group_centers(self):
+        """Set every animal's group centre to the mean position of its (species, group) herd"""
+        n = self.count
+        if not n:
+            return
+        keys = self.species_code[:n].astype(np.int64) * (1 << 40) + self.group_id[:n]
+        _, herd = np.unique(keys, return_inverse=True)
+        sizes = np.bincount(herd)
+        centre_x = np.bincount(herd, self.position[:n, 0]) / sizes
+        centre_y = np.bincount(herd, self.position[:n, 1]) / sizes
+        self.group_center[:n, 0] = centre_x[herd]
+        self.group_center[:n, 1] = centre_y[herd]
+        self.has_group_center[:n] = True
+
+    def species_totals(self):
+        """Population and health/hunger/thirst sums of each species"""
+        n = self.count
+        codes = self.species_code[:n]
+        length = len(self.species_names)
+        columns = [np.bincount(codes, minlength=length)]
+        for name in ("health", "hunger", "thirst"):
+            columns.append(np.bincount(codes, getattr(self, name)[:n], minlength=length))
+        return {species: tuple(column[code].item() for column in columns)
+                for code, species in enumerate(self.species_names)}
+
+    def sync_index(self, index):
+        """Move the animals that changed cell in a SpatialHash"""
+        n = self.count
+        cells = np.floor(self.position[:n] / index.cell_size).astype(np.int64)
+        changed = (cells[:, 0] != self.cell_x[:n]) | (cells[:, 1] != self.cell_y[:n])
+        for slot in np.flatnonzero(changed).tolist():
+            index.move(self.views[slot])
+        self.cell_x[:n] = cells[:, 0]
+        self.cell_y[:n] = cells[:, 1]
+
+    def visible(self, camera_offset, margin=100):
+        """Views of the animals whose position falls inside the padded viewport"""
+        n = self.count
+        screen = self.position[:n] - camera_offset
+        inside = ((screen[:, 0] >= -margin) & (screen[:, 0] <= SCREEN_WIDTH + margin) &
+                  (screen[:, 1] >= -margin) & (screen[:, 1] <= SCREEN_HEIGHT + margin))
+        return [self.views[slot] for slot in np.flatnonzero(inside)]
+
+
+def kernel_scalar(name):
+    def get(self):
+        return getattr(self.kernel, name)[self.slot].item()
+
+    def set(self, value):
+        getattr(self.kernel, name)[self.slot] = value
+
+    return property(get, set)
+
+
+def kernel_point(name, flag=None):
+    def get(self):
+        if flag is not None and not getattr(self.kernel, flag)[self.slot]:
+            return None
+        return tuple(getattr(self.kernel, name)[self.slot].tolist())
+
+    def set(self, value):
+        if flag is not None:
+            getattr(self.kernel, flag)[self.slot] = value is not None
+        if value is not None:
+            getattr(self.kernel, name)[self.slot] = value
+
+    return property(get, set)
+
+
+class KernelAnimal(Animal):
+    """Animal whose simulation state lives in an AnimalKernel slot"""
+
+    hunger = kernel_scalar("hunger")
+    thirst = kernel_scalar("thirst")
+    health = kernel_scalar("health")
+    energy = kernel_scalar("energy")
+    speed = kernel_scalar("speed")
+    age = kernel_scalar("age")
+    need_rate = kernel_scalar("need_rate")
+    need_threshold = kernel_scalar("need_threshold")
+    wander_timer = kernel_scalar("wander_timer")
+    rotation = kernel_scalar("rotation")
+    frame = kernel_scalar("frame")
+    lod_elapsed = kernel_scalar("lod_elapsed")
+    wandering = kernel_scalar("wandering")
+    group_id = kernel_scalar("group_id")
+    position = kernel_point("position")
+    previous_position = kernel_point("previous_position")
+    target_position = kernel_point("target_position", "has_target")
+    group_center = kernel_point("group_center", "has_group_center")
+
+    def __init__(self, species, position, terrain, animal_manager):
+        self.kernel = animal_manager.kernel
+        self.slot = self.kernel.allocate(self)
+        self.kernel.species_code[self.slot] = self.kernel.code_of(species)
+        super().__init__(species, position, terrain, animal_manager)
+
+    @property
+    def state(self):
+        return ANIMAL_STATES[self.kernel.state[self.slot]]
+
+    @state.setter
+    def state(self, value):
+        self.kernel.state[self.slot] = ANIMAL_STATES.index(value)
+
+    @property
+    def rect(self):
+        self.sprite_rect.center = self.position
+        return self.sprite_rect
+
+    @rect.setter
+    def rect(self, value):
+        self.sprite_rect = value
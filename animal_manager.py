@@ -1,15 +1,37 @@
 import pygame
 import random
 import json
+import numpy as np
 from animal import Animal
+from animal_kernel import AnimalKernel, KernelAnimal
+from animal_needs import EventAnimal, NeedsSchedule
+from spatial_hash import SpatialHash
+from group_registry import GroupRegistry
+from population_stats import PopulationStats
+from lod_scheduler import LodScheduler
+from periodic_scheduler import PeriodicScheduler
+from sprite_atlas import SpriteAtlas, build_species_image
 from constants import *
+from utils import lerp_position
 
 class AnimalManager:
-    def __init__(self, game_state, terrain):
+    def __init__(self, game_state, terrain, backend="objects", max_population=MAX_ANIMALS,
+                 rotation_steps=ANIMAL_ROTATION_STEPS, needs_mode="tick"):
+        if backend not in ANIMAL_BACKENDS:
+            raise ValueError(f"Unknown animal backend {backend!r}")
+        if needs_mode not in ANIMAL_NEEDS_MODES:
+            raise ValueError(f"Unknown needs mode {needs_mode!r}")
+        if needs_mode == "events" and backend != "objects":
+            raise ValueError("Event-driven needs are only available with the objects backend")
+        
         self.game_state = game_state
         self.terrain = terrain
+        self.backend = backend
+        self.max_population = max_population
         self.animals = []
         self.animals_group = pygame.sprite.Group()
+        self.index = SpatialHash()
+        self.lod = LodScheduler()
         self.buildings = None
         
         self.species_config = {
@@ -51,7 +73,39 @@ class AnimalManager:
             "zebra": 10
         }
         
+        self.atlases = {
+            species: SpriteAtlas(build_species_image(config, self.species_colors[species]), rotation_steps)
+            for species, config in self.species_config.items()
+        }
+        
+        # The "arrays" backend keeps animal state in NumPy columns and steps
+        # the whole population at once; Animal objects become views onto it.
+        # In "events" mode needs are read lazily off straight lines and an
+        # animal only re-decides when a NeedsSchedule event says it should.
+        self.kernel = None
+        self.needs_schedule = None
+        if backend == "arrays":
+            self.kernel = AnimalKernel(self)
+            self.animal_class = KernelAnimal
+        elif needs_mode == "events":
+            self.needs_schedule = NeedsSchedule()
+            self.animal_class = EventAnimal
+        else:
+            self.animal_class = Animal
+        
+        # The kernel computes group centres from its own position column, so
+        # the registry only needs to follow positions for object animals.
+        self.groups = GroupRegistry(track_positions=self.kernel is None)
+        self.stats = PopulationStats(self.species_config)
+        
+        # Population-wide bookkeeping runs on its own schedule, not every tick
+        self.jobs = PeriodicScheduler()
+        self.jobs.add_job("group_movement", self.update_group_movement, 0.25)
+        self.jobs.add_job("natural_spawning", self.try_natural_spawning, 1.0)
+        self.jobs.add_job("group_reproduction", self.try_group_reproduction, 1.0)
+        
         self.spawn_initial_animals()
+        self.update_animal_stats()
     
     def set_building_manager(self, building_manager):
         """Set the building manager (needed to find food/water sources)"""
@@ -65,7 +119,7 @@ class AnimalManager:
     
     def spawn_animal(self, species, nearby=None, group_id=None):
         spawn_position = self.find_spawn_position(species, nearby)
-        animal = Animal(species, spawn_position, self.terrain, self)
+        animal = self.animal_class(species, spawn_position, self.terrain, self)
         if group_id is not None:
             animal.group_id = group_id
         else:
@@ -73,6 +127,8 @@ class AnimalManager:
 
         self.animals.append(animal)
         self.animals_group.add(animal)
+        self.index.insert(animal)
+        self.groups.add(animal)
         return animal
 
     def find_spawn_position(self, species, nearby=None):
@@ -102,64 +158,87 @@ class AnimalManager:
 
     def update(self, dt):
         """Update all animals"""
-        for animal in list(self.animals):
-            animal.step(dt)
+        if self.kernel:
+            self.update_kernel(dt)
+            return
+        
+        if self.needs_schedule:
+            self.needs_schedule.advance(dt)
+        
+        animals = list(self.animals)
+        elapsed = np.array([animal.lod_elapsed for animal in animals])
+        step_dts = self.lod.plan([animal.position for animal in animals], elapsed, dt)
+        
+        moving = []
+        for animal, waited, step_dt in zip(animals, elapsed.tolist(), step_dts.tolist()):
+            animal.lod_elapsed = waited
+            if not step_dt:
+                animal.previous_position = animal.position
+                continue
+            
+            animal.step(step_dt)
             
             if animal.health <= 0:
                 self.remove_animal(animal)
+            elif animal.pending_move:
+                moving.append(animal)
+        
+        if moving:
+            into_water = self.terrain.is_water_batch([animal.pending_move[0] for animal in moving])
+            for animal, water in zip(moving, into_water.tolist()):
+                if animal.apply_move(water):
+                    self.index.move(animal)
+                    self.groups.move(animal)
         
+        self.jobs.run(dt)
         self.update_animal_stats()
+    
+    def update_kernel(self, dt):
+        """Update all animals with the vectorized backend"""
+        n = self.kernel.count
+        step_dts = self.lod.plan(self.kernel.position[:n], self.kernel.lod_elapsed[:n], dt)
+        dead = self.kernel.step(step_dts)
+        if dead:
+            for animal in dead:
+                self.groups.remove(animal)
+                self.kernel.release(animal)
+                self.animals_group.remove(animal)
+                self.index.remove(animal)
+            dead = set(dead)
+            self.animals = [animal for animal in self.animals if animal not in dead]
+        self.kernel.sync_index(self.index)
         
-        self.try_natural_spawning(dt)
-        self.try_group_reproduction(dt)
-        self.update_group_movement(dt)
+        self.jobs.run(dt)
+        self.update_animal_stats()
     
     def remove_animal(self, animal):
         """Remove an animal from the simulation"""
         if animal in self.animals:
             self.animals.remove(animal)
             self.animals_group.remove(animal)
+            self.index.remove(animal)
+            self.groups.remove(animal)
+            if self.kernel:
+                self.kernel.release(animal)
+            if self.needs_schedule:
+                self.needs_schedule.cancel(animal)
     
     def update_animal_stats(self):
-        """Update game state with statistics about animal populations"""
-        stats = {}
-        
-        for species in self.species_config:
-            stats[species] = {
-                "population": 0,
-                "avg_health": 0,
-                "avg_hunger": 0,
-                "avg_thirst": 0
-            }
-        
-        for animal in self.animals:
-            species = animal.species
-            stats[species]["population"] += 1
-            stats[species]["avg_health"] += animal.health
-            stats[species]["avg_hunger"] += animal.hunger
-            stats[species]["avg_thirst"] += animal.thirst
-        
-        for species, data in stats.items():
-            pop = data["population"]
-            if pop > 0:
-                data["avg_health"] /= pop
-                data["avg_hunger"] /= pop
-                data["avg_thirst"] /= pop
+        """Refresh the shared population snapshot and pass it to the game state (once per tick)"""
+        if self.kernel:
+            self.stats.set_totals(self.kernel.species_totals())
+        else:
+            self.stats.collect(self.animals)
         
-        self.game_state.update_ecosystem_balance(stats)
+        self.game_state.update_ecosystem_balance(self.stats.species_stats())
     
     def try_natural_spawning(self, dt):
         """Small chance for animals to naturally spawn"""
-        if len(self.animals) >= 40:
+        if len(self.animals) >= self.max_population:
             return
         
-        species_counts = {}
-        for animal in self.animals:
-            species = animal.species
-            species_counts[species] = species_counts.get(species, 0) + 1
-        
         for species, config in self.species_config.items():
-            current_count = species_counts.get(species, 0)
+            current_count = self.groups.species_counts.get(species, 0)
             
             max_count = self.initial_population.get(species, 5) * 1.5
             if current_count < max_count:
@@ -169,53 +248,37 @@ class AnimalManager:
     
     def try_group_reproduction(self, dt):
         """Let animal groups reproduce if they meet conditions"""
-        group_min_size = 3
-        reproduction_cooldown = 30
-
-        if not hasattr(self, "last_reproduction_time"):
-            self.last_reproduction_time = {}
-
-        species_groups = {}
-
-        for animal in self.animals:
-            if animal.age >= 0.8:
-                key = (animal.species, animal.group_id)
-                species_groups.setdefault(key, []).append(animal)
+        now = self.game_state.time_elapsed
+        for group in self.groups.breeding_groups(GROUP_MIN_BREEDING_ADULTS):
+            if now - group.last_reproduction > GROUP_REPRODUCTION_COOLDOWN:
+                adults = [animal for animal in group.members.values() if animal.age >= self.groups.adult_age]
+                parent = random.choice(adults)
+                self.spawn_animal(group.species, nearby=parent.position, group_id=group.group_id)
+                group.last_reproduction = now
+                self.game_state.add_notification(f"{group.species.capitalize()} group {group.group_id} reproduced!")
 
-        for (species, group_id), group in species_groups.items():
-            if len(group) >= group_min_size:
-                last_time = self.last_reproduction_time.get((species, group_id), 0)
-                if self.game_state.time_elapsed - last_time > reproduction_cooldown:
-                    parent = random.choice(group)
-                    self.spawn_animal(species, nearby=parent.position, group_id=group_id)
-                    self.last_reproduction_time[(species, group_id)] = self.game_state.time_elapsed
-                    self.game_state.add_notification(f"{species.capitalize()} group {group_id} reproduced!")
-
-    def get_tourist_appeal(self):
-        """Calculate the tourism appeal of the current animal population"""
-        if not self.animals:
-            return 0
-        
-        species_present = set([animal.species for animal in self.animals])
-        base_appeal = len(species_present) * 30
-        
-        animal_appeal = 0
-        for animal in self.animals:
-            species_appeal = self.species_config[animal.species]["tourist_appeal"]
-            health_factor = animal.health / 100
-            animal_appeal += species_appeal * health_factor
-        
-        animal_appeal = animal_appeal / len(self.animals)
+    def species_tiles(self):
+        """Species index (in species_config order) and flat grid tile of every animal"""
+        if self.kernel:
+            n = self.kernel.count
+            return self.kernel.species_code[:n].astype(np.int64), self.terrain.grid_indices_at(self.kernel.position[:n])
         
-        total_appeal = base_appeal + (animal_appeal * 10)
-        
-        return min(100, total_appeal)
+        names = list(self.species_config)
+        codes = np.array([names.index(animal.species) for animal in self.animals], dtype=np.int64)
+        positions = np.array([animal.position for animal in self.animals], dtype=np.float64).reshape(-1, 2)
+        return codes, self.terrain.grid_indices_at(positions)
     
-    def render(self, screen, camera_offset):
-        """Render all animals with camera offset"""
-        for animal in self.animals:
-            screen_pos = (animal.position[0] - camera_offset[0], 
-                         animal.position[1] - camera_offset[1])
+    def get_tourist_appeal(self):
+        """Tourism appeal of the animal population, as of the last stats snapshot"""
+        return self.stats.tourist_appeal()
+    
+    def render(self, screen, camera_offset, alpha=1.0):
+        """Render all animals with camera offset, alpha of the way into the latest tick"""
+        animals = self.kernel.visible(camera_offset) if self.kernel else self.animals
+        for animal in animals:
+            position = lerp_position(animal.previous_position, animal.position, alpha)
+            screen_pos = (position[0] - camera_offset[0], 
+                         position[1] - camera_offset[1])
             
             if (screen_pos[0] < -100 or screen_pos[0] > SCREEN_WIDTH + 100 or
                 screen_pos[1] < -100 or screen_pos[1] > SCREEN_HEIGHT + 100):
@@ -271,7 +334,7 @@ class AnimalManager:
             
             for data in animal_data:
                 pos = (data["position"][0], data["position"][1])
-                animal = Animal(data["species"], pos, self.terrain, self)
+                animal = self.animal_class(data["species"], pos, self.terrain, self)
                 animal.hunger = data["hunger"]
                 animal.thirst = data["thirst"]
                 animal.health = data["health"]
@@ -279,26 +342,21 @@ class AnimalManager:
                 animal.state = data["state"]
                 self.animals.append(animal)
                 self.animals_group.add(animal)
+                self.index.insert(animal)
+                self.groups.add(animal)
             
+            self.update_animal_stats()
             return True
         except Exception as e:
             print(f"Error loading animals: {str(e)}")
             return False
         
     def update_group_movement(self, dt):
-        group_centers = {}
-        group_members = {}
-
-        for animal in self.animals:
-            key = (animal.species, animal.group_id)
-            group_members.setdefault(key, []).append(animal)
-
-        for key, members in group_members.items():
-            if not members:
-                continue
-            avg_x = sum(a.position[0] for a in members) / len(members)
-            avg_y = sum(a.position[1] for a in members) / len(members)
-            group_centers[key] = (avg_x, avg_y)
-
-            for animal in members:
-                animal.group_center = group_centers[key]
+        if self.kernel:
+            self.kernel.update_group_centers()
+            return
+        
+        for group in self.groups.groups.values():
+            center = group.centroid()
+            for animal in group.members.values():
+                animal.group_center = center
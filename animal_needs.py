@@ -0,0 +1,165 @@
+import itertools
+from heapq import heappop, heappush
+from animal import Animal
+from constants import *
+
+NEED_NAMES = ("hunger", "thirst", "energy", "health")
+
+# Events fire just past a crossing so strict comparisons see the new side
+EVENT_EPSILON = 1e-6
+
+
+class NeedsSchedule:
+    """Simulation clock plus a priority queue of the next time each animal's needs cross a threshold"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.queue = []
+        self.order = itertools.count()
+        self.events_fired = 0
+
+    def schedule(self, animal, delay):
+        """Replace an animal's pending event with one delay seconds from now (None = never)"""
+        animal.needs_version += 1
+        if delay is not None:
+            heappush(self.queue, (self.now + delay + EVENT_EPSILON, next(self.order),
+                                  animal, animal.needs_version))
+
+    def cancel(self, animal):
+        animal.needs_version += 1
+
+    def advance(self, dt):
+        """Move the clock forward and fire every event that has come due"""
+        target = self.now + dt
+        while self.queue and self.queue[0][0] <= target:
+            when, _, animal, version = heappop(self.queue)
+            if version == animal.needs_version:
+                # Switch rates at the crossing itself, not at the end of the tick
+                self.now = max(self.now, when)
+                self.events_fired += 1
+                animal.on_needs_event()
+        self.now = target
+
+
+def crossing_time(value, rate, level):
+    """Seconds until a value changing at rate reaches level, or None if it never will"""
+    if rate > 0 and value < level:
+        return (level - value) / rate
+    if rate < 0 and value > level:
+        return (value - level) / -rate
+    return None
+
+
+def need_property(name):
+    def get(self):
+        # Needs are linear between events, so read them off the line
+        value = self.need_values[name] + self.need_rates[name] * (self.schedule.now - self.need_time)
+        return value if value < 100 else 100
+
+    def set(self, value):
+        self.materialize_needs()
+        self.need_values[name] = value
+        if self.needs_ready:
+            self.refresh_needs()
+            self.decision_due = True
+
+    return property(get, set)
+
+
+class EventAnimal(Animal):
+    """Animal whose needs are evaluated lazily and whose decisions run only when a threshold is crossed"""
+
+    hunger = need_property("hunger")
+    thirst = need_property("thirst")
+    energy = need_property("energy")
+    health = need_property("health")
+
+    def __init__(self, species, position, terrain, animal_manager):
+        self.schedule = animal_manager.needs_schedule
+        self.need_values = dict.fromkeys(NEED_NAMES, 0.0)
+        self.need_rates = dict.fromkeys(NEED_NAMES, 0.0)
+        self.need_time = self.schedule.now
+        self.needs_version = 0
+        self.needs_ready = False
+        self.current_state = "idle"
+        super().__init__(species, position, terrain, animal_manager)
+        self.needs_ready = True
+        self.decision_due = True
+        self.refresh_needs()
+
+    @property
+    def state(self):
+        return self.current_state
+
+    @state.setter
+    def state(self, value):
+        if value == self.current_state:
+            return
+        self.current_state = value
+        if self.needs_ready:
+            # Resting changes the energy rate, and any action-driven change
+            # needs a fresh decision just like the per-tick mode would make.
+            self.materialize_needs()
+            self.refresh_needs()
+            self.decision_due = True
+
+    def materialize_needs(self):
+        """Fold the time since the last event into the stored need values"""
+        now = self.schedule.now
+        if now != self.need_time:
+            for name in NEED_NAMES:
+                self.need_values[name] = getattr(self, name)
+            self.need_time = now
+
+    def refresh_needs(self):
+        """Recompute the need rates and schedule the next threshold crossing"""
+        hunger, thirst, energy, health = (self.need_values[name] for name in NEED_NAMES)
+        rates = self.need_rates
+
+        rates["hunger"] = 0.5 * self.need_rate if hunger < 100 else 0
+        rates["thirst"] = 0.7 * self.need_rate if thirst < 100 else 0
+        rates["energy"] = -0.3 + (1.0 if self.state == "resting" else 0)
+        if hunger > 90 or thirst > 90:
+            rates["health"] = -0.5
+        else:
+            rates["health"] = 0.1 if health < 100 else 0
+
+        crossings = [
+            crossing_time(hunger, rates["hunger"], self.need_threshold),
+            crossing_time(hunger, rates["hunger"], 90),
+            crossing_time(hunger, rates["hunger"], 100),
+            crossing_time(thirst, rates["thirst"], self.need_threshold),
+            crossing_time(thirst, rates["thirst"], 90),
+            crossing_time(thirst, rates["thirst"], 100),
+            crossing_time(energy, rates["energy"], 20),
+            crossing_time(energy, rates["energy"], 80),
+            crossing_time(health, rates["health"], 0),
+            crossing_time(health, rates["health"], 20),
+            crossing_time(health, rates["health"], 100),
+        ]
+        if health < 20:
+            # A weak animal picks food or water by whichever need is larger
+            crossings.append(crossing_time(hunger - thirst, rates["hunger"] - rates["thirst"], 0))
+
+        crossings = [t for t in crossings if t is not None]
+        self.schedule.schedule(self, min(crossings) if crossings else None)
+
+    def on_needs_event(self):
+        self.materialize_needs()
+        self.refresh_needs()
+        self.decision_due = True
+
+    def step(self, dt):
+        """Act on the current state, deciding again only after a threshold crossing"""
+        self.previous_position = self.position
+        if self.decision_due:
+            self.decide_action()
+            self.decision_due = False
+        self.act(dt)
+
+    def rest(self, dt):
+        """Rest to regain energy (the resting rate is part of the energy line)"""
+        self.wandering = False
+
+        if self.energy > 80:
+            self.state = "idle"
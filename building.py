@@ -1,5 +1,7 @@
 import pygame
 from constants import *
+from utils import lerp_color
+from sprite_cache import sprite_cache, filled_sprite
 
 class Building(pygame.sprite.Sprite):
     def __init__(self, building_type, position, building_manager):
@@ -10,8 +12,7 @@ class Building(pygame.sprite.Sprite):
         width = int(config['scale'][0] * TILE_SIZE)
         height = int(config['scale'][1] * TILE_SIZE)
         
-        self.image = pygame.Surface((width, height), pygame.SRCALPHA)
-        self.image.fill(config['color'])
+        self.image = sprite_cache.get((building_type, "intact"), filled_sprite, config['color'], (width, height))
         
         self.rect = self.image.get_rect()
         self.rect.center = position
@@ -22,14 +23,18 @@ class Building(pygame.sprite.Sprite):
         self.building_manager = building_manager
         self.terrain = building_manager.terrain
         
-        self.health = 100
+        self.current_health = 100
         self.last_maintenance = 0
-        
-        building_manager.buildings.append(self)
-        
-        cost = config['cost']
-        building_manager.game_state.add_funds(-cost)
-        building_manager.game_state.add_notification(f"Built {building_type} for ${cost}")
+    
+    @property
+    def health(self):
+        return self.current_health
+    
+    @health.setter
+    def health(self, value):
+        # Keep the manager's per-type health sums in step with every change
+        self.building_manager.types.health_changed(self, value - self.current_health)
+        self.current_health = value
     
     def step(self, dt):
         """Update building state"""
@@ -47,12 +52,8 @@ class Building(pygame.sprite.Sprite):
         
         if self.health < 30:
             config = self.building_manager.building_config[self.building_type]
-            base_color = config['color']
-            new_color = lerp_color(base_color, RED, 0.5)
-            
-            width, height = self.image.get_size()
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
-            self.image.fill(new_color)
+            self.image = sprite_cache.get((self.building_type, "damaged"), filled_sprite,
+                                          lerp_color(config['color'], RED, 0.5), self.image.get_size())
     
     def perform_maintenance(self):
         """Perform maintenance on the building"""
@@ -66,9 +67,8 @@ class Building(pygame.sprite.Sprite):
             
             config = self.building_manager.building_config[self.building_type]
             
-            width, height = self.image.get_size()
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
-            self.image.fill(config['color'])
+            self.image = sprite_cache.get((self.building_type, "intact"), filled_sprite,
+                                          config['color'], self.image.get_size())
             
             self.game_state.add_notification(f"Repaired {self.building_type} for ${cost:.2f}")
             return True
@@ -1,17 +1,33 @@
 import pygame
 import json
+import math
+import numpy as np
 from building import Building
+from building_registry import BuildingRegistry
+from amenity_rasters import AmenityRasters
+from resource_fields import ResourceFields
+from spatial_hash import SpatialHash
 
 from constants import *
 from utils import distance
-from types import SimpleNamespace
 class BuildingManager:
     def __init__(self, game_state, terrain):
         self.game_state = game_state
         self.terrain = terrain
         self.buildings = []
         self.buildings_group = pygame.sprite.Group()
+        self.index = SpatialHash()
+        self.types = BuildingRegistry()
+        # Buildings covering each tile, indexed [y, x] like the terrain arrays
+        self.occupancy = np.zeros((terrain.size, terrain.size), dtype=np.int16)
+        # Bumped whenever a footprint check could change: buildings or terrain tiles
+        self.occupancy_version = 0
+        # What each tile is near, for tourists; paths are followed through terrain edits
+        self.amenities = AmenityRasters(terrain)
+        self.rebuild_amenities()
+        terrain.add_tile_listener(self.on_tile_changed)
         self.pending_building_type = None
+        self.resource_fields = ResourceFields(terrain)
         
         self.entrance_tile = None
         self.exit_tile     = None
@@ -80,29 +96,19 @@ class BuildingManager:
     def place_building(self, building_type, world_pos):
         self.pending_building_type = building_type
 
-        if self.is_position_occupied(world_pos):
+        footprint = self.footprint(building_type, world_pos)
+        if not self.is_footprint_free(footprint):
             self.game_state.add_notification("Can't build there!")
             return False
 
         cost = self.building_config[building_type]["cost"]
         self.game_state.add_funds(-cost)
+        world_pos = self.footprint_center(footprint)
 
         if building_type == "path":
-            gx, gy = self.terrain.world_to_grid(world_pos)
-            self.terrain.terrain_grid[gy][gx]["type"] = "path"
-
-            tx, ty = gx * TILE_SIZE, gy * TILE_SIZE
-            pygame.draw.rect(self.terrain.terrain_surface,
-                            self.building_config["path"]["color"],
-                            (tx, ty, TILE_SIZE, TILE_SIZE))
-
-            cell = (gx, gy)
-            self.buildings.append(SimpleNamespace(
-                building_type="path",
-                position=self.terrain.grid_to_world(cell),
-                rect=pygame.Rect(tx, ty, TILE_SIZE, TILE_SIZE),
-                grid_pos=cell
-            ))
+            # Paths live in the terrain's path layer, not in the buildings list
+            cell = footprint[:2]
+            self.terrain.set_tile_type(*cell, "path")
 
             if self.entrance_tile is None:
                 self.entrance_tile = cell
@@ -116,50 +122,116 @@ class BuildingManager:
 
 
         b = Building(building_type, world_pos, self)
-        self.buildings.append(b)
+        self.add_building(b)
         self.game_state.add_notification(f"Built {building_type} for ${cost}")
         return True
 
+    def add_building(self, building):
+        """Register a building with every index the manager keeps"""
+        self.buildings.append(building)
+        self.index.insert(building)
+        self.types.add(building)
+        self.resource_fields.add_building(building)
+        self.mark_footprint(building, 1)
+        if building.building_type in self.amenities.amenities:
+            self.amenities.add(building.building_type, self.terrain.world_to_grid(building.position))
 
-    def snap_to_grid(self, position):
-        grid_x, grid_y = self.world_to_grid(position)
-        return self.grid_to_world((grid_x, grid_y))
-
-    def is_position_occupied(self, world_pos):
-            """
-            True only if new building’s rect would *overlap* an existing one.
-            Adjacent (=touching) is OK.
-            """
-            cfg = self.building_config.get(self.pending_building_type, {})
-            w = int(cfg.get("scale",(1,1))[0] * TILE_SIZE)
-            h = int(cfg.get("scale",(1,1))[1] * TILE_SIZE)
-            new_rect = pygame.Rect(0,0,w,h)
-            new_rect.center = world_pos
-
-            for b in self.buildings:
-                if new_rect.colliderect(b.rect):
-                    return True
+    def snap_to_grid(self, position, building_type="path"):
+        return self.footprint_center(self.footprint(building_type, position))
+
+    def footprint(self, building_type, world_pos):
+        """Tiles (left, top, width, height) a building centred near world_pos covers once snapped"""
+        scale = self.building_config[building_type]["scale"]
+        width = max(1, math.ceil(scale[0]))
+        height = max(1, math.ceil(scale[1]))
+        size = self.terrain.size
+        half = size * TILE_SIZE / 2
+
+        # Round the top-left corner to the nearest tile boundary
+        left = math.floor((world_pos[0] + half) / TILE_SIZE - width / 2 + 0.5)
+        top = math.floor((world_pos[1] + half) / TILE_SIZE - height / 2 + 0.5)
+        left = max(0, min(left, size - width))
+        top = max(0, min(top, size - height))
+        return (left, top, width, height)
+
+    def footprint_center(self, footprint):
+        left, top, width, height = footprint
+        half = self.terrain.size * TILE_SIZE / 2
+        return ((left + width / 2) * TILE_SIZE - half, (top + height / 2) * TILE_SIZE - half)
+
+    def mark_footprint(self, building, delta):
+        if self.occupancy.shape != self.terrain.terrain_types.shape:
+            self.rebuild_occupancy()
+            return
+        left, top, width, height = self.footprint(building.building_type, building.position)
+        self.occupancy[top:top + height, left:left + width] += delta
+        self.occupancy_version += 1
+
+    def rebuild_occupancy(self):
+        """Recount every footprint, e.g. after the terrain was replaced by one of another size"""
+        self.occupancy = np.zeros(self.terrain.terrain_types.shape, dtype=np.int16)
+        for building in self.buildings:
+            left, top, width, height = self.footprint(building.building_type, building.position)
+            self.occupancy[top:top + height, left:left + width] += 1
+        self.occupancy_version += 1
+        self.rebuild_amenities()
+
+    def rebuild_amenities(self):
+        self.amenities.reset()
+        for cell in self.terrain.paths.cells:
+            self.amenities.add("path", cell)
+        for building in self.buildings:
+            if building.building_type in self.amenities.amenities:
+                self.amenities.add(building.building_type, self.terrain.world_to_grid(building.position))
+
+    def on_tile_changed(self, grid_x, grid_y, old_code, new_code):
+        # Footprint checks read the terrain too, so cached placement previews are stale
+        self.occupancy_version += 1
+        if new_code == TERRAIN_PATH:
+            self.amenities.add("path", (grid_x, grid_y))
+        elif old_code == TERRAIN_PATH:
+            self.amenities.remove("path", (grid_x, grid_y))
+
+    def is_footprint_free(self, footprint):
+        if self.occupancy.shape != self.terrain.terrain_types.shape:
+            self.rebuild_occupancy()
+        left, top, width, height = footprint
+        if self.occupancy[top:top + height, left:left + width].any():
             return False
+        return not (self.terrain.terrain_types[top:top + height, left:left + width] == TERRAIN_PATH).any()
+
+    def is_footprint_buildable(self, footprint):
+        """True if every tile under the footprint is grass"""
+        left, top, width, height = footprint
+        return bool((self.terrain.terrain_types[top:top + height, left:left + width] == TERRAIN_GRASS).all())
+
+    def is_position_occupied(self, world_pos, building_type=None):
+        """True if the snapped footprint would share a tile with an existing building.
+        Adjacent (touching) buildings are fine."""
+        building_type = building_type or self.pending_building_type or "path"
+        return not self.is_footprint_free(self.footprint(building_type, world_pos))
     
     def update(self, dt):
-        """Update all non-road buildings each frame."""
+        """Update all buildings each frame."""
         for b in list(self.buildings):
-            if getattr(b, "building_type", None) != "path":
-                b.step(dt)
+            b.step(dt)
     
     def remove_building(self, building):
         """Remove a building from the game"""
         if building in self.buildings:
             self.buildings.remove(building)
             self.buildings_group.remove(building)
+            self.index.remove(building)
+            self.types.remove(building)
+            self.resource_fields.remove_building(building)
+            self.mark_footprint(building, -1)
+            if building.building_type in self.amenities.amenities:
+                self.amenities.remove(building.building_type, self.terrain.world_to_grid(building.position))
             self.game_state.add_notification(f"{building.building_type} has broken down completely")
     
     def render(self, screen, camera_offset):
         """Render all buildings with camera offset"""
         for building in self.buildings:
-            if not hasattr(building, "image"):
-                continue
-
             screen_pos = (building.position[0] - camera_offset[0], 
                         building.position[1] - camera_offset[1])
             
@@ -174,30 +246,24 @@ class BuildingManager:
     
     def get_monthly_maintenance_cost(self):
         """Calculate the total monthly maintenance cost for all buildings"""
-        total_cost = 0
-        for building in self.buildings:
-            cost = self.building_config[building.building_type]["maintenance_cost"]
-            health_factor = 1 + (1 - building.health / 100) 
-            total_cost += cost * health_factor
-        
-        return total_cost
+        path_cost = len(self.terrain.paths) * self.building_config["path"]["maintenance_cost"]
+        return self.types.maintenance_cost(self.building_config) + path_cost
     
     def calculate_tourist_infrastructure_score(self):
         """Calculate a score for tourist infrastructure"""
-        if not self.buildings:
+        path_count = len(self.terrain.paths)
+        if not self.buildings and not path_count:
             return 0
 
-        path_count = len([b for b in self.buildings if getattr(b, "building_type", None) == "path"])
-        platform_count = len([b for b in self.buildings if getattr(b, "building_type", None) == "viewing_platform"])
+        platform_count = self.types.count("viewing_platform")
 
         base_score = min(80, path_count * 5 + platform_count * 15)
 
-        buildings_with_health = [b for b in self.buildings if hasattr(b, "health")]
+        avg_health = self.types.average_health()
 
-        if not buildings_with_health:
+        if avg_health is None:
             return base_score
 
-        avg_health = sum(b.health for b in buildings_with_health) / len(buildings_with_health)
         health_factor = avg_health / 100
 
         return base_score * health_factor
@@ -229,10 +295,14 @@ class BuildingManager:
                 self.remove_building(building)
             
             for data in building_data:
+                if data["building_type"] == "path":
+                    # Path tiles come back with the terrain's edits
+                    continue
                 position = (data["position"][0], data["position"][1])
                 building = Building(data["building_type"], position, self)
                 building.health = data["health"]
                 self.buildings_group.add(building)
+                self.add_building(building)
             
             return True
         except Exception as e:
@@ -0,0 +1,54 @@
+from constants import *
+
+
+class BuildingRegistry:
+    """Buildings grouped by type, with running counts and health sums per type.
+
+    Buildings report their own health changes (see Building.health), so the
+    sums stay current through decay and repair."""
+
+    def __init__(self):
+        self.by_type = {}
+        self.health_sums = {}
+
+    def add(self, building):
+        kind = building.building_type
+        self.by_type.setdefault(kind, {})[id(building)] = building
+        self.health_sums[kind] = self.health_sums.get(kind, 0.0) + building.health
+
+    def remove(self, building):
+        kind = building.building_type
+        del self.by_type[kind][id(building)]
+        self.health_sums[kind] -= building.health
+        if not self.by_type[kind]:
+            del self.by_type[kind]
+            del self.health_sums[kind]
+
+    def health_changed(self, building, delta):
+        if id(building) in self.by_type.get(building.building_type, ()):
+            self.health_sums[building.building_type] += delta
+
+    def clear(self):
+        self.by_type.clear()
+        self.health_sums.clear()
+
+    def count(self, kind):
+        return len(self.by_type.get(kind, ()))
+
+    def of_type(self, kind):
+        """List of the buildings of one type"""
+        return list(self.by_type.get(kind, {}).values())
+
+    def average_health(self):
+        """Mean health of all buildings, or None if there are none"""
+        count = sum(len(buildings) for buildings in self.by_type.values())
+        return sum(self.health_sums.values()) / count if count else None
+
+    def maintenance_cost(self, building_config):
+        """Monthly maintenance of every building; damaged ones cost up to twice as much"""
+        total = 0
+        for kind, buildings in self.by_type.items():
+            # sum of (1 + (1 - health / 100)) over the type
+            damage = len(buildings) - self.health_sums[kind] / 100
+            total += building_config[kind]["maintenance_cost"] * (len(buildings) + damage)
+        return total
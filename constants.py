@@ -1,6 +1,14 @@
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS = 60
+
+# Fixed simulation step (seconds of game time), the most ticks run per
+# rendered frame, and the wall-clock time those ticks may take.
+SIM_TICK = 1 / 30
+SIM_MAX_SUBSTEPS = 20
+SIM_FRAME_BUDGET = 0.012
+# In-game hours that pass per second of game time
+GAME_HOURS_PER_SECOND = 0.2
 TILE_SIZE = 32
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -25,4 +33,51 @@ STATE_PLAYING = 1
 STATE_PAUSED = 2
 STATE_GAME_OVER = 3
 STATE_WIN = 4
-STATE_ANIMAL_OVERVIEW = 5
\ No newline at end of file
+STATE_ANIMAL_OVERVIEW = 5
+
+TERRAIN_WATER = 0
+TERRAIN_GRASS = 1
+TERRAIN_ROCKY = 2
+TERRAIN_MOUNTAIN = 3
+TERRAIN_PATH = 4
+TERRAIN_TYPES = ["water", "grass", "rocky", "mountain", "path"]
+TERRAIN_CODES = {name: code for code, name in enumerate(TERRAIN_TYPES)}
+
+TERRAIN_CHUNK_SIZE = 16
+TERRAIN_CHUNK_CACHE_BUDGET = 32 * 1024 * 1024
+
+TERRAIN_CACHE_DIR = "terrain_cache"
+TERRAIN_CACHE_MAX_ENTRIES = 32
+
+ROUTE_CACHE_MAX_ENTRIES = 4096
+
+MAX_ANIMALS = 40
+ANIMAL_BACKENDS = ("objects", "arrays")
+ANIMAL_ROTATION_STEPS = 36
+ANIMAL_NEEDS_MODES = ("tick", "events")
+MAX_TOURISTS = 30
+# Tourist arrivals per second of game time at full attractiveness
+TOURIST_DAY_RATE = 0.1
+TOURIST_NIGHT_RATE = 0.01
+TOURIST_OPENING_HOURS = (8, 18)
+TOURIST_BACKENDS = ("objects", "arrays")
+GROUP_ADULT_AGE = 0.8
+GROUP_MIN_BREEDING_ADULTS = 3
+GROUP_REPRODUCTION_COOLDOWN = 30
+
+# Level-of-detail tiers for entity AI: (name, pixels beyond the screen
+# edge, update every N ticks). The last tier catches everything further out.
+LOD_TIERS = (
+    ("visible", 0, 1),
+    ("near", 8 * TILE_SIZE, 3),
+    ("far", None, 10),
+)
+
+# Wall-clock time periodic jobs may take per update (seconds)
+PERIODIC_JOB_BUDGET = 0.001
+
+# Amenities tracked per tile for tourists, and how many tiles they reach
+AMENITY_TYPES = ("path", "viewing_platform")
+AMENITY_RADIUS = 3
+# How far (in tiles) tourists on the arrays backend can see animals
+TOURIST_VIEW_RADIUS = 10
@@ -1,17 +1,30 @@
 import pygame
-import random
+import numpy as np
 from tourist import Tourist
+from tourist_kernel import TouristKernel, KernelTourist
+from spatial_hash import SpatialHash
+from lod_scheduler import LodScheduler
+from periodic_scheduler import PeriodicScheduler
+from tourist_arrivals import TouristArrivals
+from entity_pool import ActiveSet, EntityPool
 from constants import *
+from utils import lerp_position
 
 class EconomyManager:
-    def __init__(self, game_state, animal_manager, building_manager):
+    def __init__(self, game_state, animal_manager, building_manager, backend="objects",
+                 max_tourists=MAX_TOURISTS):
+        if backend not in TOURIST_BACKENDS:
+            raise ValueError(f"Unknown tourist backend {backend!r}")
+        
         self.game_state = game_state
         self.animals = animal_manager
         self.buildings = building_manager
         self.terrain = building_manager.terrain
         
-        self.tourists = []
+        self.tourists = ActiveSet()
         self.tourists_group = pygame.sprite.Group()
+        self.index = SpatialHash()
+        self.lod = LodScheduler()
         self.reviews = []
         self.avg_review_score = 3.0
         self.daily_income = 0
@@ -22,9 +35,25 @@ class EconomyManager:
         
         self.base_tourist_rate = 5
         self.tourist_modifier = self.game_state.difficulty_settings["tourist_rate"]
+        self.arrivals = TouristArrivals()
         self.entrance_fee = 20
         
         self.vehicle_manager = None
+        
+        # The "arrays" backend keeps tourist state in NumPy columns and steps
+        # the whole crowd at once; Tourist objects become views onto it.
+        self.backend = backend
+        self.max_tourists = max_tourists
+        self.kernel = None
+        self.tourist_class = Tourist
+        self.jobs = PeriodicScheduler()
+        if backend == "arrays":
+            self.kernel = TouristKernel(self)
+            self.tourist_class = KernelTourist
+            self.jobs.add_job("animal_coverage", lambda elapsed: self.kernel.update_animal_coverage(), 0.25)
+        
+        # Tourists who leave are kept and handed back out to new arrivals
+        self.tourist_pool = EntityPool(lambda position: self.tourist_class(position, self))
     
     def update(self, dt):
         """Update economic systems"""
@@ -55,11 +84,7 @@ class EconomyManager:
         """Perform monthly economic updates"""
         maintenance_cost = self.buildings.get_monthly_maintenance_cost()
         
-        animal_food_cost = 0
-        for animal in self.animals.animals:
-            species_config = self.animals.species_config[animal.species]
-            food_cost = species_config["food_consumption"] * 100
-            animal_food_cost += food_cost
+        animal_food_cost = self.animals.stats.food_consumption() * 100
         
         staff_salary = 1000
         
@@ -74,24 +99,70 @@ class EconomyManager:
 
         self.game_state.evaluate_monthly_win_conditions(
             visitor_count = len(self.tourists),
-            herbivores    = self.count_species(["elephant", "zebra"]),
-            carnivores    = self.count_species(["lion"])
+            herbivores    = sum(self.animals.stats.population(species) for species in ("elephant", "zebra")),
+            carnivores    = self.animals.stats.population("lion")
         )
     
     def update_tourists(self, dt):
         """Update all tourists"""
-        for tourist in list(self.tourists):
-            if tourist.step(dt):
-                pass
+        self.jobs.run(dt)
+        if self.kernel:
+            self.update_tourist_kernel(dt)
+            return
+        
+        tourists = list(self.tourists)
+        elapsed = np.array([tourist.lod_elapsed for tourist in tourists])
+        step_dts = self.lod.plan([tourist.position for tourist in tourists], elapsed, dt)
+        
+        moving = []
+        for tourist, waited, step_dt in zip(tourists, elapsed.tolist(), step_dts.tolist()):
+            tourist.lod_elapsed = waited
+            if not step_dt:
+                tourist.previous_position = tourist.position
+                continue
+            
+            if not tourist.step(step_dt) and tourist.pending_position:
+                moving.append(tourist)
+        
+        if moving:
+            into_water = self.terrain.is_water_batch([tourist.pending_position for tourist in moving])
+            for tourist, water in zip(moving, into_water.tolist()):
+                if tourist.apply_move(water):
+                    self.index.move(tourist)
+    
+    def update_tourist_kernel(self, dt):
+        """Update all tourists with the vectorized backend"""
+        n = self.kernel.count
+        step_dts = self.lod.plan(self.kernel.position[:n], self.kernel.lod_elapsed[:n], dt)
+        leaving = self.kernel.step(step_dts)
+        if leaving:
+            scores = [max(1, min(5, int(tourist.satisfaction / 20))) for tourist in leaving]
+            for tourist in leaving:
+                self.remove_tourist(tourist)
+            self.add_reviews(scores)
+        self.kernel.sync_index(self.index)
+    
+    def remove_tourist(self, tourist):
+        """Take a tourist out of the park (leaving, or boarding a jeep)"""
+        if tourist in self.tourists:
+            self.tourists.remove(tourist)
+            self.tourists_group.remove(tourist)
+            self.index.remove(tourist)
+            if self.kernel:
+                self.kernel.release(tourist)
+            self.tourist_pool.release(tourist)
+    
+    def tourists_at_tile(self, tile):
+        """Tourists standing on a grid tile"""
+        if self.kernel:
+            return self.kernel.tourists_at_tile(tile)
+        return [tourist for tourist in self.tourists if self.terrain.world_to_grid(tourist.position) == tile]
     
     def spawn_tourists(self, dt):
-        """Spawn new tourists based on park reputation and time of day"""
-        hour = (self.game_state.time_of_day) % 24
-        
-        if 8 <= hour <= 18:
-            spawn_chance = 0.1 * dt
-        else:
-            spawn_chance = 0.01 * dt
+        """Spawn the tourists arriving this tick, based on park reputation and time of day"""
+        current_tourists = len(self.tourists)
+        if current_tourists >= self.max_tourists:
+            return
         
         reputation_factor = (self.avg_review_score / 3)
         animal_appeal = self.animals.get_tourist_appeal() / 100
@@ -99,25 +170,26 @@ class EconomyManager:
         
         park_attractiveness = (reputation_factor * 0.3) + (animal_appeal * 0.5) + (infrastructure * 0.2)
         
-        spawn_chance *= park_attractiveness * self.tourist_modifier
-        
-        max_tourists = 30
-        current_tourists = len(self.tourists)
-        if current_tourists >= max_tourists:
+        # However long the tick, the number of arrivals follows the hourly rate
+        arrivals = self.arrivals.sample(self.game_state.time_of_day, dt,
+                                        park_attractiveness * self.tourist_modifier)
+        arrivals = min(arrivals, self.max_tourists - current_tourists)
+        if not arrivals:
             return
         
-        if random.random() < spawn_chance:
-            terrain_size = self.terrain.size * TILE_SIZE
-            entrance_x = terrain_size / 2 - 5 * TILE_SIZE
-            entrance_y = 0
-            entrance_pos = (entrance_x, entrance_y)
-            
-            tourist = Tourist(entrance_pos, self)
+        terrain_size = self.terrain.size * TILE_SIZE
+        entrance_x = terrain_size / 2 - 5 * TILE_SIZE
+        entrance_y = 0
+        entrance_pos = (entrance_x, entrance_y)
+        
+        for _ in range(arrivals):
+            tourist = self.tourist_pool.acquire(entrance_pos)
             self.tourists.append(tourist)
             self.tourists_group.add(tourist)
-            
-            self.game_state.add_funds(self.entrance_fee)
-            self.daily_income += self.entrance_fee
+            self.index.insert(tourist)
+        
+        self.game_state.add_funds(self.entrance_fee * arrivals)
+        self.daily_income += self.entrance_fee * arrivals
     
     def add_review(self, score):
         """Add a review score (1-5) and update average"""
@@ -128,6 +200,13 @@ class EconomyManager:
         
         self.avg_review_score = sum(self.reviews) / len(self.reviews) if self.reviews else 3.0
     
+    def add_reviews(self, scores):
+        """Add several review scores at once"""
+        self.reviews.extend(scores)
+        del self.reviews[:-100]
+        
+        self.avg_review_score = sum(self.reviews) / len(self.reviews) if self.reviews else 3.0
+    
     def get_park_stats(self):
         """Get statistics about the park's performance"""
         return {
@@ -139,11 +218,13 @@ class EconomyManager:
             "monthly_expenses": self.monthly_expenses
         }
         
-    def render(self, screen, camera_offset):
-        """Render all tourists with camera offset"""
-        for tourist in self.tourists:
-            screen_pos = (tourist.position[0] - camera_offset[0], 
-                         tourist.position[1] - camera_offset[1])
+    def render(self, screen, camera_offset, alpha=1.0):
+        """Render all tourists with camera offset, alpha of the way into the latest tick"""
+        tourists = self.kernel.visible(camera_offset) if self.kernel else self.tourists
+        for tourist in tourists:
+            position = lerp_position(tourist.previous_position, tourist.position, alpha)
+            screen_pos = (position[0] - camera_offset[0], 
+                         position[1] - camera_offset[1])
             
             if (screen_pos[0] < -50 or screen_pos[0] > SCREEN_WIDTH + 50 or
                 screen_pos[1] < -50 or screen_pos[1] > SCREEN_HEIGHT + 50):
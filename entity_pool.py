@@ -0,0 +1,90 @@
+import gc
+
+
+class ActiveSet:
+    """Unordered list of live entities with O(1) add, remove and membership.
+
+    Removal swaps the last entity into the hole, so iteration order is not
+    insertion order. Entities are keyed by id() like SpatialHash."""
+
+    def __init__(self):
+        self.items = []
+        self.slots = {}
+
+    def append(self, entity):
+        if id(entity) in self.slots:
+            return
+        self.slots[id(entity)] = len(self.items)
+        self.items.append(entity)
+
+    def remove(self, entity):
+        slot = self.slots.pop(id(entity))
+        last = self.items.pop()
+        if last is not entity:
+            self.items[slot] = last
+            self.slots[id(last)] = slot
+
+    def discard(self, entity):
+        if id(entity) in self.slots:
+            self.remove(entity)
+
+    def clear(self):
+        self.items.clear()
+        self.slots.clear()
+
+    def __contains__(self, entity):
+        return id(entity) in self.slots
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+
+class EntityPool:
+    """Recycles released entities instead of building new ones.
+
+    acquire(*args) hands back a released entity after calling its
+    reset(*args), or calls factory(*args) when none are free. At most limit
+    released entities are kept."""
+
+    def __init__(self, factory, limit=1024):
+        self.factory = factory
+        self.limit = limit
+        self.free = []
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.gc_baseline = self.gc_collections()
+
+    def acquire(self, *args):
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args)
+            self.reused += 1
+            return entity
+        self.created += 1
+        return self.factory(*args)
+
+    def release(self, entity):
+        self.released += 1
+        if len(self.free) < self.limit:
+            self.free.append(entity)
+
+    @staticmethod
+    def gc_collections():
+        return [generation["collections"] for generation in gc.get_stats()]
+
+    def stats(self):
+        """Allocation counters, plus garbage collections per generation since the pool was made"""
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "free": len(self.free),
+            "gc_collections": [now - then for now, then in zip(self.gc_collections(), self.gc_baseline)],
+        }
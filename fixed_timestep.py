@@ -0,0 +1,39 @@
+import time
+from constants import *
+
+
+class FixedTimestep:
+    """Accumulates frame time and advances the simulation in fixed-size ticks"""
+
+    def __init__(self, tick=SIM_TICK, max_substeps=SIM_MAX_SUBSTEPS, frame_budget=SIM_FRAME_BUDGET):
+        self.tick = tick
+        self.max_substeps = max_substeps
+        self.frame_budget = frame_budget
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.dropped_time = 0.0
+
+    def advance(self, frame_dt, speed, step):
+        """Run step(tick) as many times as the scaled frame time allows.
+
+        Returns the interpolation factor between the last two ticks."""
+        self.accumulator += frame_dt * speed
+
+        started = time.perf_counter()
+        substeps = 0
+        while self.accumulator >= self.tick:
+            if substeps >= self.max_substeps or time.perf_counter() - started > self.frame_budget:
+                # Out of budget: let the game run slower than requested
+                # rather than owing ever more ticks to later frames.
+                self.dropped_time += self.accumulator - self.accumulator % self.tick
+                self.accumulator %= self.tick
+                break
+            step(self.tick)
+            self.accumulator -= self.tick
+            substeps += 1
+            self.ticks += 1
+
+        return self.accumulator / self.tick
+
+    def reset(self):
+        self.accumulator = 0.0
@@ -91,7 +91,7 @@ class GameState:
     
     def update(self, dt):
         self.time_elapsed += dt
-        self.time_of_day += dt * 0.2
+        self.time_of_day += dt * GAME_HOURS_PER_SECOND
         
         if self.time_of_day >= 24:
             self.time_of_day = 0
@@ -146,6 +146,16 @@ class GameState:
         else:
             self.ecosystem_balance = 0
     
+    def evaluate_monthly_win_conditions(self, visitor_count, herbivores, carnivores):
+        """Count the consecutive months that meet the difficulty's funds, visitor and animal targets"""
+        settings = self.difficulty_settings
+        if (self.funds >= settings["min_funds"] and visitor_count >= settings["min_visitors"] and
+                herbivores >= settings["min_herbivores"] and carnivores >= settings["min_carnivores"]):
+            self.consecutive_win_months += 1
+            self.add_notification(f"Monthly targets met ({self.consecutive_win_months}/{settings['months_required']})")
+        else:
+            self.consecutive_win_months = 0
+    
     def check_win_condition(self):
         """Check if the player has met the win conditions"""
         return self.funds >= self.profit_target and self.ecosystem_balance >= 75
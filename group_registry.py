@@ -0,0 +1,96 @@
+from constants import *
+
+
+class Group:
+    """Members of one (species, group_id) herd plus running totals about them"""
+
+    def __init__(self, species, group_id):
+        self.species = species
+        self.group_id = group_id
+        self.members = {}
+        self.adults = 0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.last_reproduction = 0
+
+    def __len__(self):
+        return len(self.members)
+
+    def centroid(self):
+        count = len(self.members)
+        return (self.sum_x / count, self.sum_y / count)
+
+
+class GroupRegistry:
+    """Herds kept up to date as animals are added, moved and removed.
+
+    A group is created by its first member and evicted with its last, so the
+    registry (cooldowns included) only ever holds herds that exist. Position
+    sums are only kept when track_positions is set; callers then report every
+    move so the centroids stay exact."""
+
+    def __init__(self, adult_age=GROUP_ADULT_AGE, track_positions=True):
+        self.adult_age = adult_age
+        self.track_positions = track_positions
+        self.groups = {}
+        self.species_counts = {}
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.groups)
+
+    def add(self, animal):
+        key = (animal.species, animal.group_id)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = Group(*key)
+
+        position = tuple(animal.position) if self.track_positions else None
+        group.members[id(animal)] = animal
+        self.entries[id(animal)] = (group, position)
+        if animal.age >= self.adult_age:
+            group.adults += 1
+        if position:
+            group.sum_x += position[0]
+            group.sum_y += position[1]
+        self.species_counts[animal.species] = self.species_counts.get(animal.species, 0) + 1
+        return group
+
+    def remove(self, animal):
+        group, position = self.entries.pop(id(animal))
+        del group.members[id(animal)]
+        if animal.age >= self.adult_age:
+            group.adults -= 1
+        if position:
+            group.sum_x -= position[0]
+            group.sum_y -= position[1]
+        self.species_counts[group.species] -= 1
+
+        if not group.members:
+            del self.groups[(group.species, group.group_id)]
+
+    def discard(self, animal):
+        if id(animal) in self.entries:
+            self.remove(animal)
+
+    def move(self, animal):
+        """Update the position sums after an animal has moved"""
+        group, old = self.entries[id(animal)]
+        if old is None:
+            return
+        new = tuple(animal.position)
+        group.sum_x += new[0] - old[0]
+        group.sum_y += new[1] - old[1]
+        self.entries[id(animal)] = (group, new)
+
+    def group_of(self, animal):
+        return self.entries[id(animal)][0]
+
+    def clear(self):
+        self.groups.clear()
+        self.species_counts.clear()
+        self.entries.clear()
+
+    def breeding_groups(self, min_adults):
+        """Groups with at least min_adults adult members"""
+        return [group for group in self.groups.values() if group.adults >= min_adults]
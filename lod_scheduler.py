@@ -0,0 +1,58 @@
+import numpy as np
+from constants import *
+
+
+class LodScheduler:
+    """Decides which entities update on a tick, by their distance from the viewport.
+
+    Each tier is (name, max_distance, interval): entities within max_distance
+    pixels of the screen edge (None = any distance) update every interval
+    ticks. Slower tiers are spread round-robin over their interval and get
+    the time they skipped when their turn comes, so needs and movement add up
+    to the same totals as updating every tick."""
+
+    def __init__(self, tiers=LOD_TIERS):
+        self.set_tiers(tiers)
+        self.camera_offset = None
+        self.tick_count = 0
+
+    def set_tiers(self, tiers):
+        self.tiers = tuple(tiers)
+        self.tier_names = [name for name, _, _ in self.tiers]
+        self.tier_limits = np.array([np.inf if limit is None else limit for _, limit, _ in self.tiers])
+        self.tier_intervals = np.array([interval for _, _, interval in self.tiers], dtype=np.int64)
+        self.tier_counts = {name: 0 for name in self.tier_names}
+
+    def track_camera(self, camera_offset):
+        """Follow the (mutable) camera offset used for rendering"""
+        self.camera_offset = camera_offset
+
+    def viewport_distance(self, positions):
+        """Pixel distance of each position from the visible screen rectangle"""
+        if self.camera_offset is None:
+            return np.zeros(len(positions))
+        screen = positions - np.asarray(self.camera_offset, dtype=np.float64)
+        dx = np.maximum(np.maximum(-screen[:, 0], screen[:, 0] - SCREEN_WIDTH), 0)
+        dy = np.maximum(np.maximum(-screen[:, 1], screen[:, 1] - SCREEN_HEIGHT), 0)
+        return np.hypot(dx, dy)
+
+    def plan(self, positions, elapsed, dt):
+        """Add dt to every entity's elapsed time and return the dt each should step by now.
+
+        elapsed is updated in place: it is reset for entities that are due and
+        keeps accumulating for the rest, which get 0."""
+        self.tick_count += 1
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        tiers = np.searchsorted(self.tier_limits, self.viewport_distance(positions))
+        tiers = np.minimum(tiers, len(self.tiers) - 1)
+
+        for index, count in enumerate(np.bincount(tiers, minlength=len(self.tiers))):
+            self.tier_counts[self.tier_names[index]] = int(count)
+
+        intervals = self.tier_intervals[tiers]
+        due = (np.arange(len(positions)) + self.tick_count) % intervals == 0
+
+        elapsed += dt
+        step_dt = np.where(due, elapsed, 0.0)
+        elapsed[due] = 0.0
+        return step_dt
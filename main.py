@@ -11,6 +11,7 @@ from vehicle         import VehicleManager
 from economy_manager import EconomyManager
 from ui              import UIManager
 from game_over_screen import game_over_screen
+from fixed_timestep  import FixedTimestep
 from constants       import *
 
 pygame.init()
@@ -25,6 +26,10 @@ def main(
     economy: EconomyManager = None,
     vehicles: VehicleManager = None,
     ui: UIManager = None,
+    animal_backend: str = "objects",
+    needs_mode: str = "tick",
+    tourist_backend: str = "objects",
+    max_tourists: int = MAX_TOURISTS,
 ):
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Safari Park - Pygame Edition")
@@ -37,9 +42,10 @@ def main(
     if buildings is None:
         buildings = BuildingManager(game_state, terrain)
     if animals is None:
-        animals = AnimalManager(game_state, terrain)
+        animals = AnimalManager(game_state, terrain, backend=animal_backend, needs_mode=needs_mode)
     if economy is None:
-        economy = EconomyManager(game_state, animals, buildings)
+        economy = EconomyManager(game_state, animals, buildings, backend=tourist_backend,
+                                 max_tourists=max_tourists)
     if vehicles is None:
         vehicles = VehicleManager(game_state, buildings, terrain, economy)
     if ui is None:
@@ -52,9 +58,23 @@ def main(
 
     camera_offset = [0, 0]
     camera_speed  = 500
+    animals.lod.track_camera(camera_offset)
+    economy.lod.track_camera(camera_offset)
     running = True
     game_state.set_game_speed(GameSpeed.HOUR)
 
+    def step_simulation(tick):
+        animals.update(tick)
+        buildings.update(tick)
+        economy.update(tick)
+        vehicles.update(tick)
+        game_state.update(tick)
+
+    # The simulation always advances in SIM_TICK steps, however long the
+    # frame took or however fast the game runs; rendering interpolates.
+    clock_steps = FixedTimestep()
+    alpha = 1.0
+
     while running:
         dt = clock.tick(FPS) / 1000.0
         mouse_pos = pygame.mouse.get_pos()
@@ -91,12 +111,7 @@ def main(
                 continue
 
         if game_state.game_speed > 0:
-            ts = game_state.game_speed
-            animals.update(dt * ts)
-            buildings.update(dt * ts)
-            economy.update(dt * ts)
-            vehicles.update(dt * ts)
-            game_state.update(dt * ts)
+            alpha = clock_steps.advance(dt, game_state.game_speed, step_simulation)
 
         if game_state.check_win_condition():
             result = game_over_screen(screen, ui.title_font, "You Win!")
@@ -115,9 +130,9 @@ def main(
         screen.fill(BLACK)
         terrain.render(screen, camera_offset)
         buildings.render(screen, camera_offset)
-        animals.render(screen, camera_offset)
-        economy.render(screen, camera_offset)
-        vehicles.render(screen, camera_offset)
+        animals.render(screen, camera_offset, alpha)
+        economy.render(screen, camera_offset, alpha)
+        vehicles.render(screen, camera_offset, alpha)
         ui.draw(screen, camera_offset, mouse_pos)
         pygame.display.flip()
 
@@ -137,6 +152,30 @@ if __name__ == "__main__":
         help="Difficulty level (if starting new)",
         default="medium"
     )
+    parser.add_argument(
+        "--animal-backend",
+        help="Animal simulation backend",
+        choices=ANIMAL_BACKENDS,
+        default="objects"
+    )
+    parser.add_argument(
+        "--needs-mode",
+        help="Update animal needs every tick or only at threshold crossings (objects backend)",
+        choices=ANIMAL_NEEDS_MODES,
+        default="tick"
+    )
+    parser.add_argument(
+        "--tourist-backend",
+        help="Tourist simulation backend",
+        choices=TOURIST_BACKENDS,
+        default="objects"
+    )
+    parser.add_argument(
+        "--max-tourists",
+        help="Most tourists allowed in the park at once",
+        type=int,
+        default=MAX_TOURISTS
+    )
     args = parser.parse_args()
 
     if args.load:
@@ -144,16 +183,21 @@ if __name__ == "__main__":
 
         game_state = GameState.load(save_dir / "savegame.json")
 
-        terrain = TerrainGenerator(game_state)
-        terrain.load_terrain(save_dir / "terrain.json")
+        if (save_dir / "world.json").exists():
+            terrain = TerrainGenerator.from_world(save_dir / "world.json", game_state)
+        else:
+            terrain = TerrainGenerator(game_state)
+            terrain.load_terrain(save_dir / "terrain.bin")
 
         buildings = BuildingManager(game_state, terrain)
         buildings.load_buildings(save_dir / "buildings.json")
 
-        animals = AnimalManager(game_state, terrain)
+        animals = AnimalManager(game_state, terrain, backend=args.animal_backend,
+                                needs_mode=args.needs_mode)
         animals.load_animals(save_dir / "animals.json")
 
-        economy = EconomyManager(game_state, animals, buildings)
+        economy = EconomyManager(game_state, animals, buildings, backend=args.tourist_backend,
+                                 max_tourists=args.max_tourists)
         vehicles = VehicleManager(game_state, buildings, terrain, economy)
         ui       = UIManager(game_state, animals, buildings, economy, terrain)
 
@@ -168,4 +212,6 @@ if __name__ == "__main__":
             ui            = ui
         )
     else:
-        main(difficulty=args.difficulty)
+        main(difficulty=args.difficulty, animal_backend=args.animal_backend,
+             needs_mode=args.needs_mode, tourist_backend=args.tourist_backend,
+             max_tourists=args.max_tourists)
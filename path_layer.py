@@ -0,0 +1,56 @@
+import random
+import numpy as np
+from constants import *
+
+
+class PathLayer:
+    """Path tiles of the map as a tile layer: the TERRAIN_PATH cells plus the world centre of each.
+
+    It follows terrain edits through a tile listener, so placing a path is
+    just setting the tile type, and saved worlds bring their paths back with
+    their edits."""
+
+    def __init__(self, terrain):
+        self.terrain = terrain
+        self.rebuild()
+        terrain.add_tile_listener(self.on_tile_changed)
+
+    def rebuild(self):
+        """Collect the path tiles of the current map"""
+        self.cells = []
+        self.positions = []
+        self.slots = {}
+        for y, x in np.argwhere(self.terrain.terrain_types == TERRAIN_PATH).tolist():
+            self.add((x, y))
+
+    def on_tile_changed(self, grid_x, grid_y, old_code, new_code):
+        if new_code == TERRAIN_PATH:
+            self.add((grid_x, grid_y))
+        elif old_code == TERRAIN_PATH:
+            self.remove((grid_x, grid_y))
+
+    def add(self, cell):
+        if cell in self.slots:
+            return
+        self.slots[cell] = len(self.cells)
+        self.cells.append(cell)
+        self.positions.append(self.terrain.grid_to_world(cell))
+
+    def remove(self, cell):
+        # Swap the last tile into the hole so removal stays O(1)
+        slot = self.slots.pop(cell)
+        last_cell = self.cells.pop()
+        last_position = self.positions.pop()
+        if last_cell != cell:
+            self.cells[slot] = last_cell
+            self.positions[slot] = last_position
+            self.slots[last_cell] = slot
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.slots
+
+    def random_position(self):
+        return random.choice(self.positions) if self.positions else None
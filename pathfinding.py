@@ -0,0 +1,103 @@
+from array import array
+from heapq import heappop, heappush
+from constants import *
+
+
+class PathFinder:
+    """A* over a padded walkability bitmap of path tiles, reusing its score arrays between queries"""
+
+    def __init__(self, terrain):
+        self.terrain = terrain
+        self.rebuild()
+        terrain.add_tile_listener(self.on_tile_changed)
+
+    def rebuild(self):
+        """Allocate the bitmap and score arrays for the current map"""
+        size = self.terrain.size
+        self.size = size
+        # One tile of padding on every side removes bounds checks from the inner loop
+        self.width = size + 2
+        cells = self.width * self.width
+
+        self.walkable = bytearray(cells)
+        for y, row in enumerate(self.terrain.terrain_types == TERRAIN_PATH):
+            start = (y + 1) * self.width + 1
+            self.walkable[start:start + size] = row.astype("u1").tobytes()
+
+        self.tile_x = array("i", [0]) * cells
+        self.tile_y = array("i", [0]) * cells
+        # Heap keys are ordered like the (x, y) tuples the original search compared,
+        # so ties resolve identically and routes match tile for tile.
+        self.order_to_cell = array("i", [0]) * (size * size)
+        self.cell_order = array("i", [0]) * cells
+        for y in range(size):
+            for x in range(size):
+                cell = (y + 1) * self.width + x + 1
+                self.tile_x[cell] = x
+                self.tile_y[cell] = y
+                self.order_to_cell[x * size + y] = cell
+                self.cell_order[cell] = x * size + y
+        self.order_bits = (size * size).bit_length()
+
+        self.g_score = array("i", [0]) * cells
+        self.came_from = array("i", [0]) * cells
+        self.seen = array("I", [0]) * cells
+        self.closed = array("I", [0]) * cells
+        self.query_id = 0
+
+    def on_tile_changed(self, grid_x, grid_y, old_code, new_code):
+        self.walkable[(grid_y + 1) * self.width + grid_x + 1] = new_code == TERRAIN_PATH
+
+    def search(self, start, goal):
+        """Return the tiles from start (exclusive) to goal (inclusive), or [] if unreachable"""
+        width = self.width
+        walkable = self.walkable
+        tile_x = self.tile_x
+        tile_y = self.tile_y
+        g_score = self.g_score
+        came_from = self.came_from
+        seen = self.seen
+        closed = self.closed
+        cell_order = self.cell_order
+        order_to_cell = self.order_to_cell
+        order_bits = self.order_bits
+        order_mask = (1 << order_bits) - 1
+
+        self.query_id += 1
+        query = self.query_id
+
+        start_cell = (start[1] + 1) * width + start[0] + 1
+        goal_cell = (goal[1] + 1) * width + goal[0] + 1
+        goal_x, goal_y = goal
+
+        seen[start_cell] = query
+        g_score[start_cell] = 0
+        open_set = [cell_order[start_cell]]
+
+        while open_set:
+            current = order_to_cell[heappop(open_set) & order_mask]
+            if current == goal_cell:
+                path = []
+                while current != start_cell:
+                    path.append((tile_x[current], tile_y[current]))
+                    current = came_from[current]
+                return path[::-1]
+
+            if closed[current] == query:
+                continue
+            closed[current] = query
+
+            tentative_g = g_score[current] + 1
+            for neighbor in (current - 1, current + 1, current - width, current + width):
+                if not walkable[neighbor] and neighbor != goal_cell:
+                    continue
+                if seen[neighbor] == query and tentative_g >= g_score[neighbor]:
+                    continue
+
+                seen[neighbor] = query
+                g_score[neighbor] = tentative_g
+                came_from[neighbor] = current
+                f_score = tentative_g + abs(tile_x[neighbor] - goal_x) + abs(tile_y[neighbor] - goal_y)
+                heappush(open_set, (f_score << order_bits) | cell_order[neighbor])
+
+        return []
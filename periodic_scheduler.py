@@ -0,0 +1,80 @@
+import time
+from constants import *
+
+
+class PeriodicJob:
+    """A callback that wants to run every interval seconds of game time"""
+
+    def __init__(self, name, callback, interval, elapsed=0.0):
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.elapsed = elapsed
+        self.runs = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = 0.0
+        self.deferred = 0
+
+    def overdue(self):
+        return self.elapsed / self.interval
+
+
+class PeriodicScheduler:
+    """Runs registered periodic jobs, spreading them over ticks within a wall-clock budget"""
+
+    def __init__(self, budget=PERIODIC_JOB_BUDGET):
+        self.budget = budget
+        self.jobs = {}
+
+    def add_job(self, name, callback, interval):
+        """Register callback(elapsed) to run roughly every interval seconds.
+
+        Start phases are staggered so jobs with equal intervals do not
+        all land on the same tick."""
+        phase = (len(self.jobs) * 0.618) % 1.0
+        self.jobs[name] = PeriodicJob(name, callback, interval, elapsed=interval * phase)
+        return self.jobs[name]
+
+    def remove_job(self, name):
+        self.jobs.pop(name, None)
+
+    def run(self, dt):
+        """Advance every job by dt and run the due ones, most overdue first"""
+        due = []
+        for job in self.jobs.values():
+            job.elapsed += dt
+            if job.elapsed >= job.interval:
+                due.append(job)
+        due.sort(key=PeriodicJob.overdue, reverse=True)
+
+        started = time.perf_counter()
+        for index, job in enumerate(due):
+            # The most overdue job always runs so nothing can starve
+            if index and time.perf_counter() - started > self.budget:
+                for waiting in due[index:]:
+                    waiting.deferred += 1
+                break
+
+            job_started = time.perf_counter()
+            job.callback(job.elapsed)
+            job.last_time = time.perf_counter() - job_started
+
+            job.elapsed = 0.0
+            job.runs += 1
+            job.total_time += job.last_time
+            job.max_time = max(job.max_time, job.last_time)
+
+    def stats(self):
+        """Per-job timing: runs, deferrals and mean/max/last run time in milliseconds"""
+        return {
+            job.name: {
+                "interval": job.interval,
+                "runs": job.runs,
+                "deferred": job.deferred,
+                "mean_ms": job.total_time / job.runs * 1000 if job.runs else 0.0,
+                "max_ms": job.max_time * 1000,
+                "last_ms": job.last_time * 1000,
+            }
+            for job in self.jobs.values()
+        }
@@ -0,0 +1,64 @@
+from constants import *
+
+STAT_NEEDS = ("health", "hunger", "thirst")
+
+
+class PopulationStats:
+    """Snapshot of per-species animal totals, gathered in one pass and shared by every reader"""
+
+    def __init__(self, species_config):
+        self.species_config = species_config
+        self.species = {}
+        self.total_population = 0
+        self.set_totals({})
+
+    def collect(self, animals):
+        """Rebuild the snapshot from animal objects"""
+        totals = {species: [0, 0.0, 0.0, 0.0] for species in self.species_config}
+        for animal in animals:
+            entry = totals[animal.species]
+            entry[0] += 1
+            entry[1] += animal.health
+            entry[2] += animal.hunger
+            entry[3] += animal.thirst
+        self.set_totals(totals)
+
+    def set_totals(self, totals):
+        """Rebuild the snapshot from {species: (population, health, hunger, thirst sums)}"""
+        self.species = {}
+        self.total_population = 0
+        for species in self.species_config:
+            population, *sums = totals.get(species, (0, 0.0, 0.0, 0.0))
+            data = {"population": population}
+            for name, total in zip(STAT_NEEDS, sums):
+                data[name + "_sum"] = total
+                data["avg_" + name] = total / population if population else 0
+            self.species[species] = data
+            self.total_population += population
+
+    def population(self, species):
+        return self.species[species]["population"]
+
+    def species_stats(self):
+        """Population and mean health/hunger/thirst of each species"""
+        return self.species
+
+    def tourist_appeal(self):
+        """Tourism appeal of the population, from species variety and healthy, appealing animals"""
+        if not self.total_population:
+            return 0
+
+        present = 0
+        animal_appeal = 0
+        for species, data in self.species.items():
+            if data["population"]:
+                present += 1
+                animal_appeal += self.species_config[species]["tourist_appeal"] * data["health_sum"] / 100
+
+        animal_appeal /= self.total_population
+        return min(100, present * 30 + animal_appeal * 10)
+
+    def food_consumption(self):
+        """Total food_consumption of every animal in the park"""
+        return sum(self.species_config[species]["food_consumption"] * data["population"]
+                   for species, data in self.species.items())
@@ -0,0 +1,239 @@
+import numpy as np
+from collections import Counter
+from constants import *
+
+FIELD_KINDS = ("water", "grass", "feeding_station", "water_station")
+STATION_KINDS = ("feeding_station", "water_station")
+
+
+class ResourceFields:
+    """BFS distance and next-step fields towards the nearest resource of each kind"""
+
+    def __init__(self, terrain):
+        self.terrain = terrain
+        self.station_tiles = {kind: Counter() for kind in STATION_KINDS}
+        self.rebuild_all()
+        terrain.add_tile_listener(self.on_tile_changed)
+
+    def rebuild_all(self):
+        for kind in FIELD_KINDS:
+            self.rebuild(kind)
+
+    def rebuild(self, kind):
+        """Recompute one field from scratch"""
+        tiles = self.terrain.size * self.terrain.size
+        field = {
+            "distance": np.full(tiles, -1, dtype=np.int32),
+            "next": np.arange(tiles, dtype=np.int32),
+            "source": np.full(tiles, -1, dtype=np.int32),
+            "source_count": 0
+        }
+        setattr(self, f"{kind}_field", field)
+
+        sources = self.source_tiles(kind)
+        field["distance"][sources] = 0
+        field["source"][sources] = sources
+        field["source_count"] = len(sources)
+        self.propagate(kind, sources)
+
+    def field(self, kind):
+        return getattr(self, f"{kind}_field")
+
+    def source_tiles(self, kind):
+        """Flat indices of the tiles that satisfy a need"""
+        if kind in STATION_KINDS:
+            return np.array(sorted(self.station_tiles[kind]), dtype=np.int64)
+        code = TERRAIN_WATER if kind == "water" else TERRAIN_GRASS
+        return np.flatnonzero(self.terrain.terrain_types.ravel() == code)
+
+    def passable(self, kind):
+        """Walkability mask for a field, or None when every tile is walkable"""
+        if kind == "water":
+            return None
+        return self.terrain.terrain_types.ravel() != TERRAIN_WATER
+
+    def has_sources(self, kind):
+        return self.field(kind)["source_count"] > 0
+
+    def neighbours(self, tiles):
+        """Yield (neighbour, parent) index arrays for the 4-neighbourhood of tiles"""
+        size = self.terrain.size
+        xs = tiles % size
+        for offset, valid in ((-1, xs > 0), (1, xs < size - 1), (-size, tiles >= size),
+                              (size, tiles < size * (size - 1))):
+            yield tiles[valid] + offset, tiles[valid]
+
+    def propagate(self, kind, seeds):
+        """Relax distances outwards from seed tiles, level by level"""
+        field = self.field(kind)
+        distance = field["distance"]
+        passable = self.passable(kind)
+
+        seeds = np.asarray(seeds, dtype=np.int64)
+        buckets = {}
+        for level in np.unique(distance[seeds]):
+            buckets[int(level)] = [seeds[distance[seeds] == level]]
+
+        while buckets:
+            level = min(buckets)
+            current = np.unique(np.concatenate(buckets.pop(level)))
+            current = current[distance[current] == level]
+
+            for neighbours, parents in self.neighbours(current):
+                better = (distance[neighbours] < 0) | (distance[neighbours] > level + 1)
+                if passable is not None:
+                    better &= passable[neighbours]
+                neighbours, first = np.unique(neighbours[better], return_index=True)
+                if not neighbours.size:
+                    continue
+                parents = parents[better][first]
+
+                distance[neighbours] = level + 1
+                field["next"][neighbours] = parents
+                field["source"][neighbours] = field["source"][parents]
+                buckets.setdefault(level + 1, []).append(neighbours)
+
+    def add_sources(self, kind, tiles):
+        field = self.field(kind)
+        tiles = np.asarray(tiles, dtype=np.int64)
+        field["distance"][tiles] = 0
+        field["next"][tiles] = tiles
+        field["source"][tiles] = tiles
+        field["source_count"] += len(tiles)
+        self.propagate(kind, tiles)
+
+    def remove_sources(self, kind, tiles):
+        """Forget every tile that was served by the removed sources and refill it from its border"""
+        field = self.field(kind)
+        size = self.terrain.size
+        distance = field["distance"]
+        field["source_count"] -= len(tiles)
+
+        affected = np.isin(field["source"], tiles)
+        distance[affected] = -1
+        field["source"][affected] = -1
+        field["next"][affected] = np.flatnonzero(affected)
+
+        grid = affected.reshape(size, size)
+        border = np.zeros_like(grid)
+        border[1:, :] |= grid[:-1, :]
+        border[:-1, :] |= grid[1:, :]
+        border[:, 1:] |= grid[:, :-1]
+        border[:, :-1] |= grid[:, 1:]
+        seeds = np.flatnonzero(border.ravel() & ~affected & (distance >= 0))
+        if seeds.size:
+            self.propagate(kind, seeds)
+
+    def on_tile_changed(self, grid_x, grid_y, old_code, new_code):
+        """Keep the terrain-based fields in step with a terrain edit"""
+        tile = grid_y * self.terrain.size + grid_x
+
+        for kind, code in (("water", TERRAIN_WATER), ("grass", TERRAIN_GRASS)):
+            if old_code == code and new_code != code:
+                self.remove_sources(kind, [tile])
+            elif new_code == code and old_code != code:
+                self.add_sources(kind, [tile])
+
+        for kind in ("grass",) + STATION_KINDS:
+            if old_code == TERRAIN_WATER and new_code != TERRAIN_WATER:
+                tiles = np.array([tile], dtype=np.int64)
+                seeds = [n for n, _ in self.neighbours(tiles)]
+                seeds = np.concatenate(seeds)
+                seeds = seeds[self.field(kind)["distance"][seeds] >= 0]
+                if seeds.size:
+                    self.propagate(kind, seeds)
+            elif new_code == TERRAIN_WATER and old_code != TERRAIN_WATER:
+                self.rebuild(kind)
+
+    def building_tiles(self, building):
+        """Flat indices of the tiles under a building's footprint"""
+        left, top = self.terrain.world_to_grid(building.rect.topleft)
+        right, bottom = self.terrain.world_to_grid((building.rect.right - 1, building.rect.bottom - 1))
+        return [y * self.terrain.size + x
+                for y in range(top, bottom + 1)
+                for x in range(left, right + 1)]
+
+    def add_building(self, building):
+        kind = building.building_type
+        if kind not in STATION_KINDS:
+            return
+
+        counts = self.station_tiles[kind]
+        new_tiles = []
+        for tile in self.building_tiles(building):
+            counts[tile] += 1
+            if counts[tile] == 1:
+                new_tiles.append(tile)
+        if new_tiles:
+            self.add_sources(kind, new_tiles)
+
+    def remove_building(self, building):
+        kind = building.building_type
+        if kind not in STATION_KINDS:
+            return
+
+        counts = self.station_tiles[kind]
+        freed_tiles = []
+        for tile in self.building_tiles(building):
+            counts[tile] -= 1
+            if counts[tile] <= 0:
+                del counts[tile]
+                freed_tiles.append(tile)
+        if freed_tiles:
+            self.remove_sources(kind, freed_tiles)
+
+    def distance_at(self, kind, world_pos):
+        """Tile distance to the nearest resource, or -1 if it cannot be reached"""
+        grid_x, grid_y = self.terrain.world_to_grid(world_pos)
+        return int(self.field(kind)["distance"][grid_y * self.terrain.size + grid_x])
+
+    def next_tiles(self, kind, tiles):
+        """Flat index of the next tile towards the nearest resource for each tile, -1 if none"""
+        size = self.terrain.size
+        field = self.field(kind)
+        distance = field["distance"]
+        tiles = np.asarray(tiles, dtype=np.int64)
+        result = field["next"][tiles].astype(np.int64)
+
+        stranded = distance[tiles] < 0
+        if stranded.any():
+            # Standing somewhere the field cannot reach (e.g. wading in water):
+            # step onto the best reachable neighbour instead.
+            lost = tiles[stranded]
+            xs = lost % size
+            best = np.full(lost.size, -1, dtype=np.int64)
+            best_distance = np.full(lost.size, np.iinfo(np.int32).max, dtype=np.int64)
+            for offset, valid in ((-1, xs > 0), (1, xs < size - 1), (-size, lost >= size),
+                                  (size, lost < size * (size - 1))):
+                candidate = np.where(valid, lost + offset, lost)
+                candidate_distance = distance[candidate]
+                better = valid & (candidate_distance >= 0) & (candidate_distance < best_distance)
+                best[better] = candidate[better]
+                best_distance[better] = candidate_distance[better]
+            result[stranded] = best
+
+        return result
+
+    def next_step(self, kind, world_pos):
+        """World position of the next tile towards the nearest resource, or None"""
+        size = self.terrain.size
+        grid_x, grid_y = self.terrain.world_to_grid(world_pos)
+        field = self.field(kind)
+        distance = field["distance"]
+        tile = grid_y * size + grid_x
+
+        if distance[tile] >= 0:
+            next_tile = int(field["next"][tile])
+        else:
+            # Same fallback as next_tiles, without building arrays for one animal
+            next_tile = -1
+            best = None
+            for neighbour, valid in ((tile - 1, grid_x > 0), (tile + 1, grid_x < size - 1),
+                                     (tile - size, grid_y > 0), (tile + size, grid_y < size - 1)):
+                if valid and distance[neighbour] >= 0 and (best is None or distance[neighbour] < best):
+                    next_tile = neighbour
+                    best = distance[neighbour]
+            if next_tile < 0:
+                return None
+
+        return self.terrain.grid_to_world((next_tile % size, next_tile // size))
@@ -0,0 +1,44 @@
+from collections import OrderedDict
+from constants import *
+
+
+class RouteCache:
+    """Remembers find_path results until the path network changes"""
+
+    def __init__(self, max_entries=ROUTE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.routes = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, start, goal):
+        """Return the cached route for (start, goal), or None on a miss"""
+        entry = self.routes.get((start, goal))
+        if entry is None or entry[0] != self.generation:
+            self.misses += 1
+            return None
+
+        self.routes.move_to_end((start, goal))
+        self.hits += 1
+        return entry[1]
+
+    def store(self, start, goal, route):
+        self.routes[(start, goal)] = (self.generation, tuple(route))
+        self.routes.move_to_end((start, goal))
+        if len(self.routes) > self.max_entries:
+            self.routes.popitem(last=False)
+
+    def invalidate(self):
+        """Mark every cached route stale; entries are dropped as they are replaced or aged out"""
+        self.generation += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0,
+            "entries": len(self.routes),
+            "generation": self.generation
+        }
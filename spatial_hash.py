@@ -0,0 +1,122 @@
+import math
+from constants import *
+
+
+class SpatialHash:
+    """Uniform grid of tile-sized cells mapping positions to the entities inside them"""
+
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entity_cells = {}
+
+    def __len__(self):
+        return len(self.entity_cells)
+
+    def cell_of(self, position):
+        return (math.floor(position[0] / self.cell_size), math.floor(position[1] / self.cell_size))
+
+    def insert(self, entity, position=None):
+        """Add an entity, or move it to the cell of its (new) position"""
+        cell = self.cell_of(entity.position if position is None else position)
+        # Keyed by id() so entries are matched by identity, whatever equality an entity defines
+        key = id(entity)
+        old_cell = self.entity_cells.get(key)
+        if old_cell == cell:
+            return
+        if old_cell is not None:
+            self.discard(old_cell, key)
+        self.cells.setdefault(cell, {})[key] = entity
+        self.entity_cells[key] = cell
+
+    def move(self, entity, position=None):
+        self.insert(entity, position)
+
+    def remove(self, entity):
+        cell = self.entity_cells.pop(id(entity), None)
+        if cell is not None:
+            self.discard(cell, id(entity))
+
+    def discard(self, cell, key):
+        bucket = self.cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self.cells[cell]
+
+    def clear(self):
+        self.cells.clear()
+        self.entity_cells.clear()
+
+    def candidates(self, position, radius):
+        """Yield the entities of every cell overlapping the square around a circle"""
+        left, top = self.cell_of((position[0] - radius, position[1] - radius))
+        right, bottom = self.cell_of((position[0] + radius, position[1] + radius))
+
+        # A sparse index is cheaper to scan by occupied cell than by the whole box
+        if (right - left + 1) * (bottom - top + 1) > len(self.cells):
+            for (cx, cy), bucket in self.cells.items():
+                if left <= cx <= right and top <= cy <= bottom:
+                    yield from bucket.values()
+            return
+
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    yield from bucket.values()
+
+    def query_radius(self, position, radius, predicate=None):
+        """Entities closer than radius to position"""
+        px, py = position
+        limit = radius * radius
+        found = []
+        for entity in self.candidates(position, radius):
+            ex, ey = entity.position
+            if (ex - px) ** 2 + (ey - py) ** 2 < limit and (predicate is None or predicate(entity)):
+                found.append(entity)
+        return found
+
+    def ring(self, centre, radius):
+        """Yield the cells at Chebyshev distance radius from a centre cell"""
+        cx, cy = centre
+        if radius == 0:
+            yield centre
+            return
+        for x in range(cx - radius, cx + radius + 1):
+            yield (x, cy - radius)
+            yield (x, cy + radius)
+        for y in range(cy - radius + 1, cy + radius):
+            yield (cx - radius, y)
+            yield (cx + radius, y)
+
+    def nearest(self, position, predicate=None, max_radius=None):
+        """Closest entity to position matching predicate, or None"""
+        if not self.cells:
+            return None
+
+        centre = self.cell_of(position)
+        if max_radius is None:
+            last_ring = max(max(abs(cx - centre[0]), abs(cy - centre[1])) for cx, cy in self.cells)
+        else:
+            last_ring = math.ceil(max_radius / self.cell_size) + 1
+        limit = math.inf if max_radius is None else max_radius * max_radius
+
+        px, py = position
+        best = None
+        best_distance = limit
+        for radius in range(last_ring + 1):
+            for cell in self.ring(centre, radius):
+                for entity in self.cells.get(cell, {}).values():
+                    ex, ey = entity.position
+                    d = (ex - px) ** 2 + (ey - py) ** 2
+                    if d < best_distance and (predicate is None or predicate(entity)):
+                        best = entity
+                        best_distance = d
+            # Every cell in the next ring is at least radius cells away
+            if best is not None and best_distance <= (radius * self.cell_size) ** 2:
+                break
+        return best
+
+    def pick(self, position, radius=TILE_SIZE, predicate=None):
+        """Entity under a point: the nearest one within radius"""
+        return self.nearest(position, predicate, max_radius=radius)
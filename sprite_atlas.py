@@ -0,0 +1,40 @@
+import pygame
+from constants import *
+
+
+class SpriteAtlas:
+    """A species' base sprite and its frames pre-rotated at a fixed angular resolution"""
+
+    def __init__(self, base_image, steps=ANIMAL_ROTATION_STEPS):
+        self.base_image = base_image
+        self.steps = steps
+        self.step_angle = 360 / steps
+        # Frame k faces k * step_angle degrees; the extra last frame is the
+        # unrotated sprite an animal shows before it first moves.
+        self.frames = [pygame.transform.rotate(base_image, -k * self.step_angle + 90)
+                       for k in range(steps)]
+        self.frames.append(base_image)
+        self.upright = steps
+
+    def frame_index(self, rotation):
+        """Frame closest to a heading in degrees"""
+        return round(rotation / self.step_angle) % self.steps
+
+    def frame(self, index):
+        return self.frames[index]
+
+    def memory_bytes(self):
+        return sum(f.get_width() * f.get_height() * f.get_bytesize() for f in self.frames)
+
+
+def build_species_image(config, color):
+    """Draw the base sprite of a species: a coloured body with a dark eye"""
+    width = int(config['scale'][0] * TILE_SIZE)
+    height = int(config['scale'][1] * TILE_SIZE)
+
+    image = pygame.Surface((width, height), pygame.SRCALPHA)
+    image.fill(color)
+    pygame.draw.circle(image, BLACK,
+                       (int(width * 0.7), int(height * 0.5)),
+                       int(width * 0.15))
+    return image
@@ -0,0 +1,36 @@
+import pygame
+
+
+class SpriteCache:
+    """Surfaces shared by every entity in the same visual state, drawn once on first use"""
+
+    def __init__(self):
+        self.sprites = {}
+        self.misses = 0
+
+    def get(self, key, draw, *args):
+        """Return the sprite for key, calling draw(*args) the first time it is needed"""
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.sprites[key] = draw(*args)
+            self.misses += 1
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
+
+
+def circle_sprite(color, size):
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(surface, color, (size//2, size//2), size//2)
+    return surface
+
+
+def filled_sprite(color, size):
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill(color)
+    return surface
+
+
+# Sprites handed out here are shared, so callers must never draw onto them
+sprite_cache = SpriteCache()
@@ -1,141 +1,196 @@
-import pygame
 import random
-import noise
 import json
+import numpy as np
+from pathlib import Path
 from constants import *
+from path_layer import PathLayer
+from pathfinding import PathFinder
+from route_cache import RouteCache
+from terrain_chunks import TerrainChunkCache
+from terrain_format import (base_map_cache_path, convert_json_terrain, read_base_map,
+                            read_terrain_file, store_base_map, write_terrain_file)
+from terrain_grid import TerrainGrid
+from terrain_noise import fractal_noise
 
 class TerrainGenerator:
-    def __init__(self, game_state, size=64):
+    def __init__(self, game_state, size=64, seed=None, generation_params=None,
+                 chunk_cache_budget=TERRAIN_CHUNK_CACHE_BUDGET, generate=True):
         self.game_state = game_state
         self.size = size
+        self.seed = seed if seed is not None else random.randint(0, 1000)
+        # A map from a random seed is never asked for again, so only seeded maps are cached
+        self.seeded = seed is not None
         self.tile_size = TILE_SIZE
+        self.chunk_cache_budget = chunk_cache_budget
+        self.noise_scale = 10.0
+        self.noise_octaves = 4
+        self.noise_persistence = 0.5
+        self.noise_lacunarity = 2.0
         self.water_threshold = 0.3
         self.grass_threshold = 0.7
         self.rocky_threshold = 0.9
         
-        self.terrain_grid = self.generate_terrain_grid()
+        if generation_params:
+            self.apply_generation_params(generation_params)
+        
+        self.tile_listeners = []
+        self.route_cache = RouteCache()
+        self.add_tile_listener(self.on_tile_changed)
+        if generate:
+            self.terrain_grid = self.generate_terrain_grid()
+        else:
+            self.terrain_grid = self.blank_terrain_grid()
+        self.path_finder = PathFinder(self)
+        self.paths = PathLayer(self)
         
-        self.terrain_surface = pygame.Surface((size * self.tile_size, size * self.tile_size), pygame.SRCALPHA)
-        self.vegetation_surface = pygame.Surface((size * self.tile_size, size * self.tile_size), pygame.SRCALPHA)
         self.entrance_tile = (0, self.size // 2)
         self.exit_tile = (self.size - 1, self.size // 2)
         self.create_terrain_surfaces()
     
     @classmethod
     def load(cls, filepath, game_state):
-        instance = cls(game_state)
+        instance = cls(game_state, generate=False)
         instance.load_terrain(filepath)
         return instance
     
+    @classmethod
+    def from_world(cls, filepath, game_state):
+        """Regenerate a saved world from its seed and replay the player's edits"""
+        with open(filepath, 'r') as f:
+            world_data = json.load(f)
+        
+        params = world_data["generation_params"]
+        if world_data.get("base_file"):
+            instance = cls(game_state, size=params["size"], generate=False)
+            instance.load_world(filepath)
+            return instance
+        
+        instance = cls(game_state, size=params["size"], seed=params["seed"], generation_params=params)
+        instance.apply_tile_edits(world_data["edits"])
+        return instance
+    
+    def generation_params(self):
+        """Everything needed to regenerate the base map"""
+        return {
+            "size": self.size,
+            "seed": self.seed,
+            "scale": self.noise_scale,
+            "octaves": self.noise_octaves,
+            "persistence": self.noise_persistence,
+            "lacunarity": self.noise_lacunarity,
+            "water_threshold": self.water_threshold,
+            "grass_threshold": self.grass_threshold,
+            "rocky_threshold": self.rocky_threshold
+        }
+    
+    def apply_generation_params(self, params):
+        self.size = params.get("size", self.size)
+        self.seed = params.get("seed", self.seed)
+        self.seeded = self.seeded or "seed" in params
+        self.noise_scale = params.get("scale", self.noise_scale)
+        self.noise_octaves = params.get("octaves", self.noise_octaves)
+        self.noise_persistence = params.get("persistence", self.noise_persistence)
+        self.noise_lacunarity = params.get("lacunarity", self.noise_lacunarity)
+        self.water_threshold = params.get("water_threshold", self.water_threshold)
+        self.grass_threshold = params.get("grass_threshold", self.grass_threshold)
+        self.rocky_threshold = params.get("rocky_threshold", self.rocky_threshold)
+    
     def generate_terrain_grid(self):
-        """Generate a 2D terrain grid using Perlin noise"""
-        terrain_grid = []
+        """Load the base map for the current seed from the cache, or generate it"""
+        self.tile_edits = {}
+        cache_file = base_map_cache_path(self.generation_params())
         
-        seed = random.randint(0, 1000)
-        scale = 10.0
-        octaves = 4
-        persistence = 0.5
-        lacunarity = 2.0
+        if cache_file.exists():
+            try:
+                _, self.terrain_types, self.terrain_values = read_base_map(cache_file)
+                return TerrainGrid(self)
+            except Exception as e:
+                print(f"Ignoring terrain cache {cache_file}: {str(e)}")
         
-        for y in range(self.size):
-            row = []
-            for x in range(self.size):
-                nx = x / self.size - 0.5
-                ny = y / self.size - 0.5
-                
-                noise_value = noise.pnoise2(
-                    nx * scale, 
-                    ny * scale, 
-                    octaves=octaves, 
-                    persistence=persistence, 
-                    lacunarity=lacunarity,
-                    repeatx=1024,
-                    repeaty=1024,
-                    base=seed
-                )
-                
-                noise_value = (noise_value + 1) / 2
-                
-                dist_from_center = ((x - self.size/2)**2 + (y - self.size/2)**2)**0.5
-                center_factor = max(0, 1 - (dist_from_center / (self.size/3)))
-                basin_effect = center_factor * 0.4
-                noise_value = max(0, noise_value - basin_effect)
-                
-                if noise_value < self.water_threshold:
-                    terrain_type = "water"
-                elif noise_value < self.grass_threshold:
-                    terrain_type = "grass"
-                elif noise_value < self.rocky_threshold:
-                    terrain_type = "rocky"
-                else:
-                    terrain_type = "mountain"
-                
-                row.append({
-                    "type": terrain_type,
-                    "value": noise_value
-                })
-            terrain_grid.append(row)
+        self.generate_base_map()
+        
+        if self.seeded:
+            try:
+                store_base_map(cache_file, self.terrain_types, self.terrain_values)
+            except OSError as e:
+                print(f"Could not cache terrain: {str(e)}")
         
-        return terrain_grid
+        return TerrainGrid(self)
     
-    def create_terrain_surfaces(self):
-        """Create pre-rendered surfaces for the terrain"""
-        self.terrain_surface.fill((50, 150, 50))
+    def blank_terrain_grid(self):
+        """All-water placeholder for a map that is about to be loaded from a file"""
+        self.tile_edits = {}
+        self.terrain_types = np.zeros((self.size, self.size), dtype=np.uint8)
+        self.terrain_values = np.zeros((self.size, self.size), dtype=np.float32)
+        return TerrainGrid(self)
+    
+    def generate_base_map(self):
+        """Generate the terrain arrays using vectorized Perlin noise"""
+        coords = np.arange(self.size, dtype=np.float64)
+        xs, ys = np.meshgrid(coords, coords)
         
-        for y in range(self.size):
-            for x in range(self.size):
-                tile_data = self.terrain_grid[y][x]
-                tile_x = x * self.tile_size
-                tile_y = y * self.tile_size
-                
-                if tile_data["type"] == "water":
-                    pygame.draw.rect(self.terrain_surface, LIGHT_BLUE, 
-                                    (tile_x, tile_y, self.tile_size, self.tile_size))
-                
-                elif tile_data["type"] == "rocky":
-                    pygame.draw.rect(self.terrain_surface, GRAY, 
-                                    (tile_x, tile_y, self.tile_size, self.tile_size))
-                
-                elif tile_data["type"] == "mountain":
-                    pygame.draw.rect(self.terrain_surface, DARK_GRAY, 
-                                    (tile_x, tile_y, self.tile_size, self.tile_size))
+        noise_values = fractal_noise(
+            (xs / self.size - 0.5) * self.noise_scale,
+            (ys / self.size - 0.5) * self.noise_scale,
+            self.seed,
+            octaves=self.noise_octaves,
+            persistence=self.noise_persistence,
+            lacunarity=self.noise_lacunarity
+        )
+        noise_values = (noise_values + 1) / 2
+        
+        dist_from_center = np.hypot(xs - self.size / 2, ys - self.size / 2)
+        center_factor = np.maximum(0, 1 - dist_from_center / (self.size / 3))
+        noise_values = np.maximum(0, noise_values - center_factor * 0.4)
         
-        random.seed(42)
+        thresholds = [self.water_threshold, self.grass_threshold, self.rocky_threshold]
+        self.terrain_types = np.digitize(noise_values, thresholds).astype(np.uint8)
+        self.terrain_values = noise_values.astype(np.float32)
+    
+    def set_tile_type(self, grid_x, grid_y, terrain_type):
+        """Change the terrain type of a single tile and record it as a player edit"""
+        old_code = int(self.terrain_types[grid_y, grid_x])
+        new_code = TERRAIN_CODES[terrain_type]
+        
+        self.terrain_types[grid_y, grid_x] = new_code
+        self.tile_edits[(grid_x, grid_y)] = terrain_type
+        self.chunk_cache.invalidate_tile(grid_x, grid_y)
+        
+        if old_code != new_code:
+            for listener in self.tile_listeners:
+                listener(grid_x, grid_y, old_code, new_code)
+    
+    def add_tile_listener(self, listener):
+        """Register a callback(grid_x, grid_y, old_code, new_code) for terrain edits"""
+        self.tile_listeners.append(listener)
+    
+    def on_tile_changed(self, grid_x, grid_y, old_code, new_code):
+        """Drop cached routes whenever a path tile is placed or removed"""
+        if old_code == TERRAIN_PATH or new_code == TERRAIN_PATH:
+            self.route_cache.invalidate()
+    
+    def apply_tile_edits(self, edits):
+        """Replay a delta log of [x, y, type] tile edits"""
+        for grid_x, grid_y, terrain_type in edits:
+            self.set_tile_type(grid_x, grid_y, terrain_type)
+    
+    def create_terrain_surfaces(self):
+        """Scatter vegetation and reset the chunk cache used for rendering"""
+        rng = random.Random(42)
         
         num_trees = int(self.size * self.size * 0.01)
         num_bushes = int(self.size * self.size * 0.02)
         
-        tree_color = DARK_GREEN
-        bush_color = GREEN
-        
-        for _ in range(num_trees):
-            x = random.randint(0, self.size - 1)
-            y = random.randint(0, self.size - 1)
-            
-            if self.terrain_grid[y][x]["type"] == "grass":
-                tree_x = x * self.tile_size + self.tile_size * 0.1
-                tree_y = y * self.tile_size 
-                tree_width = self.tile_size * 0.8
-                tree_height = self.tile_size * 1.2
+        self.vegetation = []
+        for kind, count in (("tree", num_trees), ("bush", num_bushes)):
+            for _ in range(count):
+                x = rng.randint(0, self.size - 1)
+                y = rng.randint(0, self.size - 1)
                 
-                pygame.draw.rect(self.vegetation_surface, BROWN, 
-                                (tree_x + tree_width/3, tree_y + tree_height/2, tree_width/3, tree_height/2))
-                pygame.draw.circle(self.vegetation_surface, tree_color, 
-                                 (int(tree_x + tree_width/2), int(tree_y + tree_height/3)), 
-                                 int(tree_width/2))
+                if self.terrain_types[y, x] == TERRAIN_GRASS:
+                    self.vegetation.append((kind, x, y))
         
-        for _ in range(num_bushes):
-            x = random.randint(0, self.size - 1)
-            y = random.randint(0, self.size - 1)
-            
-            if self.terrain_grid[y][x]["type"] == "grass":
-                bush_x = x * self.tile_size + self.tile_size * 0.25
-                bush_y = y * self.tile_size + self.tile_size * 0.25
-                bush_size = self.tile_size * 0.5
-                
-                pygame.draw.circle(self.vegetation_surface, bush_color, 
-                                 (int(bush_x + bush_size/2), int(bush_y + bush_size/2)), 
-                                 int(bush_size/2))
+        self.chunk_cache = TerrainChunkCache(self, memory_budget=self.chunk_cache_budget)
     
     def world_to_grid(self, world_pos):
         """Convert world position to grid position"""
@@ -157,113 +212,133 @@ class TerrainGenerator:
     def get_terrain_at_position(self, world_pos):
         """Get the terrain type at the given world position"""
         grid_x, grid_y = self.world_to_grid(world_pos)
-        return self.terrain_grid[grid_y][grid_x]["type"]
+        return TERRAIN_TYPES[self.terrain_types[grid_y, grid_x]]
     
     def is_water_at_position(self, world_pos):
         """Check if there is water at the given position"""
         return self.get_terrain_at_position(world_pos) == "water"
     
+    def world_to_grid_batch(self, world_positions):
+        """Convert an N×2 array of world positions to (grid_x, grid_y) index arrays"""
+        positions = np.asarray(world_positions, dtype=np.float64).reshape(-1, 2)
+        grid = ((positions + self.size * self.tile_size / 2) / self.tile_size).astype(np.int64)
+        np.clip(grid, 0, self.size - 1, out=grid)
+        return grid[:, 0], grid[:, 1]
+    
+    def grid_indices_at(self, world_positions):
+        """Flat grid indices (grid_y * size + grid_x) for an N×2 array of world positions"""
+        grid_x, grid_y = self.world_to_grid_batch(world_positions)
+        return grid_y * self.size + grid_x
+    
+    def grid_indices_to_world(self, tiles):
+        """World positions (N×2) of the centres of flat grid indices"""
+        tiles = np.asarray(tiles)
+        offset = self.tile_size / 2 - self.size * self.tile_size / 2
+        return np.column_stack((tiles % self.size * self.tile_size + offset,
+                                tiles // self.size * self.tile_size + offset))
+    
+    def terrain_codes_at(self, world_positions):
+        """TERRAIN_* codes for an N×2 array of world positions"""
+        grid_x, grid_y = self.world_to_grid_batch(world_positions)
+        return self.terrain_types[grid_y, grid_x]
+    
+    def is_water_batch(self, world_positions):
+        """Boolean array, True where a position is on water"""
+        return self.terrain_codes_at(world_positions) == TERRAIN_WATER
+    
+    def passable_batch(self, world_positions):
+        """Boolean array, True where a land entity may stand"""
+        return self.terrain_codes_at(world_positions) != TERRAIN_WATER
+    
     def is_suitable_for_building(self, world_pos):
         """Check if the given position is suitable for building"""
         return self.get_terrain_at_position(world_pos) == "grass"
     
     def render(self, screen, camera_offset):
-        """Render the terrain with camera offset"""
-        viewport_rect = pygame.Rect(
-            camera_offset[0], 
-            camera_offset[1], 
-            SCREEN_WIDTH, 
-            SCREEN_HEIGHT
-        )
-        
-        terrain_rect = pygame.Rect(
-            viewport_rect.x + self.size * self.tile_size / 2,
-            viewport_rect.y + self.size * self.tile_size / 2, 
-            viewport_rect.width, 
-            viewport_rect.height
-        )
-        
-        screen.blit(self.terrain_surface, (-camera_offset[0] - self.size * self.tile_size / 2, 
-                                          -camera_offset[1] - self.size * self.tile_size / 2))
-        screen.blit(self.vegetation_surface, (-camera_offset[0] - self.size * self.tile_size / 2, 
-                                            -camera_offset[1] - self.size * self.tile_size / 2))
+        """Render the visible terrain chunks with camera offset"""
+        self.chunk_cache.render(screen, camera_offset)
     
-    def save_terrain(self, filename="terrain.json"):
-        """Save terrain data to a file"""
-        serialized_grid = []
-        for row in self.terrain_grid:
-            serialized_row = []
-            for tile in row:
-                serialized_row.append({
-                    "type": tile["type"],
-                    "value": tile["value"]
-                })
-            serialized_grid.append(serialized_row)
+    def save_terrain(self, filename="terrain.bin"):
+        """Save terrain data to a binary terrain file"""
+        write_terrain_file(filename, self.terrain_types, self.terrain_values)
+        return True
+    
+    def load_terrain(self, filename="terrain.bin"):
+        """Memory-map terrain data from a file, converting legacy JSON saves once"""
+        try:
+            binary_file = Path(filename).with_suffix(".bin")
+            json_file = Path(filename).with_suffix(".json")
             
-        terrain_data = {
-            "size": self.size,
-            "terrain_grid": serialized_grid
+            if json_file.exists() and (not binary_file.exists() or
+                                       binary_file.stat().st_mtime < json_file.stat().st_mtime):
+                convert_json_terrain(json_file, binary_file)
+            
+            self.size, self.terrain_types, self.terrain_values = read_terrain_file(binary_file)
+            self.seed = None
+            self.base_file = binary_file
+            self.tile_edits = {}
+            self.terrain_grid = TerrainGrid(self)
+            self.route_cache.invalidate()
+            self.path_finder.rebuild()
+            self.paths.rebuild()
+            self.create_terrain_surfaces()
+            
+            return True
+        except Exception as e:
+            print(f"Error loading terrain: {str(e)}")
+            return False
+    
+    def save_world(self, filename="world.json"):
+        """Save the world as its generation parameters plus a delta of edited tiles"""
+        world_data = {
+            "generation_params": self.generation_params(),
+            "edits": [[x, y, terrain_type] for (x, y), terrain_type in self.tile_edits.items()]
         }
         
+        if self.seed is None:
+            # Maps loaded from a full terrain file have no seed, so keep that file as the base
+            base_file = Path(filename).with_name("terrain_base.bin")
+            if Path(self.base_file).resolve() != base_file.resolve():
+                _, base_types, base_values = read_terrain_file(self.base_file)
+                write_terrain_file(base_file, base_types, base_values)
+            world_data["base_file"] = base_file.name
+        
         with open(filename, 'w') as f:
-            json.dump(terrain_data, f)
+            json.dump(world_data, f)
         
         return True
     
-    def load_terrain(self, filename="terrain.json"):
-        """Load terrain data from a file"""
+    def load_world(self, filename="world.json"):
+        """Rebuild the terrain from a world file's seed or base map and replay its edits"""
         try:
             with open(filename, 'r') as f:
-                terrain_data = json.load(f)
+                world_data = json.load(f)
             
-            self.size = terrain_data["size"]
-            self.terrain_grid = terrain_data["terrain_grid"]
-            
-            self.terrain_surface = pygame.Surface((self.size * self.tile_size, self.size * self.tile_size), pygame.SRCALPHA)
-            self.vegetation_surface = pygame.Surface((self.size * self.tile_size, self.size * self.tile_size), pygame.SRCALPHA)
-            self.create_terrain_surfaces()
+            if world_data.get("base_file"):
+                if not self.load_terrain(Path(filename).with_name(world_data["base_file"])):
+                    return False
+            else:
+                self.apply_generation_params(world_data["generation_params"])
+                self.terrain_grid = self.generate_terrain_grid()
+                self.route_cache.invalidate()
+                self.path_finder.rebuild()
+                self.paths.rebuild()
+                self.create_terrain_surfaces()
             
+            self.apply_tile_edits(world_data["edits"])
             return True
         except Exception as e:
-            print(f"Error loading terrain: {str(e)}")
+            print(f"Error loading world: {str(e)}")
             return False
 
     def find_path(self, start, goal):
-        from heapq import heappop, heappush
-
-        def heuristic(a, b):
-            return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-        open_set = []
-        heappush(open_set, (0, start))
-        came_from = {}
-        g_score = {start: 0}
-
-        while open_set:
-            _, current = heappop(open_set)
-            if current == goal:
-                path = []
-                while current in came_from:
-                    path.append(current)
-                    current = came_from[current]
-                return path[::-1]
-
-            for dx, dy in [(-1,0),(1,0),(0,-1),(0,1)]:
-                neighbor = (current[0] + dx, current[1] + dy)
-                nx, ny = neighbor
-
-                if not (0 <= nx < self.size and 0 <= ny < self.size):
-                    continue
-
-                tile_type = self.terrain_grid[ny][nx]["type"]
-                if neighbor != goal and tile_type != "path":
-                    continue
-
-                tentative_g = g_score[current] + 1
-                if tentative_g < g_score.get(neighbor, float('inf')):
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    f_score = tentative_g + heuristic(neighbor, goal)
-                    heappush(open_set, (f_score, neighbor))
-
-        return []
+        """Find a route along path tiles, reusing cached routes while the network is unchanged"""
+        start = tuple(start)
+        goal = tuple(goal)
+        
+        route = self.route_cache.get(start, goal)
+        if route is None:
+            route = self.path_finder.search(start, goal)
+            self.route_cache.store(start, goal, route)
+        
+        return list(route)
@@ -0,0 +1,151 @@
+import pygame
+import numpy as np
+from collections import OrderedDict
+from constants import *
+
+# RGBA colour of each terrain code, indexed by TERRAIN_* value
+TILE_PALETTE = np.zeros((len(TERRAIN_TYPES), 4), dtype=np.uint8)
+TILE_PALETTE[:] = (50, 150, 50, 255)
+TILE_PALETTE[TERRAIN_WATER] = LIGHT_BLUE
+TILE_PALETTE[TERRAIN_ROCKY] = (*GRAY, 255)
+TILE_PALETTE[TERRAIN_MOUNTAIN] = (*DARK_GRAY, 255)
+TILE_PALETTE[TERRAIN_PATH] = (*BROWN, 255)
+
+
+def draw_vegetation(surface, kind, tile_x, tile_y, origin):
+    """Draw a tree or bush for a tile, relative to the surface's map-pixel origin"""
+    tile_size = TILE_SIZE
+
+    if kind == "tree":
+        tree_x = tile_x * tile_size + tile_size * 0.1
+        tree_y = tile_y * tile_size
+        tree_width = tile_size * 0.8
+        tree_height = tile_size * 1.2
+
+        # Round in map pixels first so chunk edges line up with a full-map raster
+        trunk = pygame.Rect(tree_x + tree_width/3, tree_y + tree_height/2, tree_width/3, tree_height/2)
+        pygame.draw.rect(surface, BROWN, trunk.move(-origin[0], -origin[1]))
+        pygame.draw.circle(surface, DARK_GREEN,
+                           (int(tree_x + tree_width/2) - origin[0], int(tree_y + tree_height/3) - origin[1]),
+                           int(tree_width/2))
+    else:
+        bush_x = tile_x * tile_size + tile_size * 0.25
+        bush_y = tile_y * tile_size + tile_size * 0.25
+        bush_size = tile_size * 0.5
+
+        pygame.draw.circle(surface, GREEN,
+                           (int(bush_x + bush_size/2) - origin[0], int(bush_y + bush_size/2) - origin[1]),
+                           int(bush_size/2))
+
+
+class TerrainChunkCache:
+    """Rasterizes fixed-size terrain chunks on demand and keeps them in an LRU cache"""
+
+    def __init__(self, terrain, chunk_size=TERRAIN_CHUNK_SIZE, memory_budget=TERRAIN_CHUNK_CACHE_BUDGET):
+        self.terrain = terrain
+        self.chunk_size = chunk_size
+        self.memory_budget = memory_budget
+        self.chunks = OrderedDict()
+        self.memory_used = 0
+        self.chunks_rasterized = 0
+
+        self.chunk_count = (terrain.size + chunk_size - 1) // chunk_size
+        self.vegetation = {}
+        for kind, x, y in terrain.vegetation:
+            # Trees are taller than a tile, so file them under every chunk they overlap
+            bottom = y + 1 if kind == "tree" else y
+            for cy in {y // chunk_size, min(bottom, terrain.size - 1) // chunk_size}:
+                self.vegetation.setdefault((x // chunk_size, cy), []).append((kind, x, y))
+
+    def chunk_tile_rect(self, cx, cy):
+        """Return (x, y, width, height) of a chunk in tiles"""
+        x = cx * self.chunk_size
+        y = cy * self.chunk_size
+        return (x, y,
+                min(self.chunk_size, self.terrain.size - x),
+                min(self.chunk_size, self.terrain.size - y))
+
+    def rasterize_chunk(self, cx, cy):
+        """Build the surface for one chunk from the terrain arrays"""
+        x, y, width, height = self.chunk_tile_rect(cx, cy)
+        colors = TILE_PALETTE[self.terrain.terrain_types[y:y + height, x:x + width].T]
+
+        tiles = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.surfarray.pixels3d(tiles)[:] = colors[..., :3]
+        pygame.surfarray.pixels_alpha(tiles)[:] = colors[..., 3]
+        tile_size = self.terrain.tile_size
+        surface = pygame.transform.scale(tiles, (width * tile_size, height * tile_size))
+
+        origin = (x * tile_size, y * tile_size)
+        for kind, tile_x, tile_y in self.vegetation.get((cx, cy), ()):
+            draw_vegetation(surface, kind, tile_x, tile_y, origin)
+
+        self.chunks_rasterized += 1
+        return surface
+
+    def get_chunk(self, cx, cy):
+        """Return a chunk surface, rasterizing it if it is not cached"""
+        key = (cx, cy)
+        surface = self.chunks.get(key)
+        if surface is not None:
+            self.chunks.move_to_end(key)
+            return surface
+
+        surface = self.rasterize_chunk(cx, cy)
+        self.chunks[key] = surface
+        self.memory_used += self.surface_bytes(surface)
+        return surface
+
+    def evict(self, keep=()):
+        """Drop least recently used chunks until the cache fits its memory budget"""
+        for key in list(self.chunks):
+            if self.memory_used <= self.memory_budget:
+                break
+            if key in keep:
+                continue
+            self.memory_used -= self.surface_bytes(self.chunks.pop(key))
+
+    def invalidate_tile(self, grid_x, grid_y):
+        """Forget the chunk containing a tile so it is re-rasterized on next use"""
+        key = (grid_x // self.chunk_size, grid_y // self.chunk_size)
+        surface = self.chunks.pop(key, None)
+        if surface is not None:
+            self.memory_used -= self.surface_bytes(surface)
+
+    def clear(self):
+        self.chunks.clear()
+        self.memory_used = 0
+
+    def visible_chunks(self, camera_offset):
+        """Return the chunk coordinates overlapping the viewport"""
+        chunk_pixels = self.chunk_size * self.terrain.tile_size
+        half_map = self.terrain.size * self.terrain.tile_size / 2
+
+        left = int((camera_offset[0] + half_map) // chunk_pixels)
+        top = int((camera_offset[1] + half_map) // chunk_pixels)
+        right = int((camera_offset[0] + half_map + SCREEN_WIDTH - 1) // chunk_pixels)
+        bottom = int((camera_offset[1] + half_map + SCREEN_HEIGHT - 1) // chunk_pixels)
+
+        return [(cx, cy)
+                for cy in range(max(0, top), min(self.chunk_count - 1, bottom) + 1)
+                for cx in range(max(0, left), min(self.chunk_count - 1, right) + 1)]
+
+    def render(self, screen, camera_offset):
+        """Blit only the chunks inside the viewport"""
+        chunk_pixels = self.chunk_size * self.terrain.tile_size
+        half_map = self.terrain.size * self.terrain.tile_size / 2
+
+        # Snap the map origin once so neighbouring chunks never drift apart by a pixel
+        origin_x = int(-camera_offset[0] - half_map)
+        origin_y = int(-camera_offset[1] - half_map)
+
+        visible = self.visible_chunks(camera_offset)
+        for cx, cy in visible:
+            surface = self.get_chunk(cx, cy)
+            screen.blit(surface, (origin_x + cx * chunk_pixels, origin_y + cy * chunk_pixels))
+
+        self.evict(keep=set(visible))
+
+    @staticmethod
+    def surface_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
@@ -0,0 +1,96 @@
+import os
+import json
+import struct
+import hashlib
+import numpy as np
+from pathlib import Path
+from constants import *
+
+# Binary terrain layout: 16-byte header, size*size uint8 type codes padded to
+# a 4-byte boundary, then size*size float32 noise values, all little-endian.
+TERRAIN_MAGIC = b"UFTR"
+TERRAIN_FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI4x")
+
+
+def values_offset(size, header_size=HEADER.size):
+    types_end = header_size + size * size
+    return (types_end + 3) & ~3
+
+
+def write_terrain_file(filename, terrain_types, terrain_values):
+    """Write the terrain arrays to a binary terrain file"""
+    size = terrain_types.shape[0]
+    temp_name = f"{filename}.tmp"
+
+    # Write beside the target and swap it in, so a map that is currently
+    # memory-mapped from the old file keeps its pages valid.
+    with open(temp_name, "wb") as f:
+        f.write(HEADER.pack(TERRAIN_MAGIC, TERRAIN_FORMAT_VERSION, HEADER.size, size))
+        f.write(np.ascontiguousarray(terrain_types, dtype=np.uint8).tobytes())
+        f.write(b"\0" * (values_offset(size) - HEADER.size - size * size))
+        f.write(np.ascontiguousarray(terrain_values, dtype="<f4").tobytes())
+    os.replace(temp_name, filename)
+
+
+def read_terrain_file(filename):
+    """Memory-map a binary terrain file and return (size, types, values)"""
+    with open(filename, "rb") as f:
+        magic, version, header_size, size = HEADER.unpack(f.read(HEADER.size))
+
+    if magic != TERRAIN_MAGIC:
+        raise ValueError(f"{filename} is not a terrain file")
+    if version != TERRAIN_FORMAT_VERSION:
+        raise ValueError(f"Unsupported terrain format version {version}")
+
+    # Copy-on-write: edits such as new path tiles never touch the file on disk
+    terrain_types = np.memmap(filename, dtype=np.uint8, mode="c",
+                              offset=header_size, shape=(size, size))
+    terrain_values = np.memmap(filename, dtype="<f4", mode="c",
+                               offset=values_offset(size, header_size), shape=(size, size))
+    return size, terrain_types, terrain_values
+
+
+def read_terrain_json(filename):
+    """Parse a legacy JSON terrain save into (size, types, values)"""
+    with open(filename, "r") as f:
+        terrain_data = json.load(f)
+
+    size = terrain_data["size"]
+    grid = terrain_data["terrain_grid"]
+    terrain_types = np.array(
+        [[TERRAIN_CODES[tile["type"]] for tile in row] for row in grid], dtype=np.uint8)
+    terrain_values = np.array(
+        [[tile["value"] for tile in row] for row in grid], dtype=np.float32)
+    return size, terrain_types, terrain_values
+
+
+def convert_json_terrain(json_filename, binary_filename):
+    """One-time conversion of a legacy JSON terrain save to the binary format"""
+    size, terrain_types, terrain_values = read_terrain_json(json_filename)
+    write_terrain_file(binary_filename, terrain_types, terrain_values)
+
+
+def base_map_cache_path(generation_params, cache_dir=TERRAIN_CACHE_DIR):
+    """Cache file for the base map generated from a seed and parameter set"""
+    encoded = json.dumps(generation_params, sort_keys=True).encode()
+    digest = hashlib.sha1(encoded).hexdigest()[:12]
+    return Path(cache_dir) / f"{generation_params['seed']}_{digest}.bin"
+
+
+def read_base_map(cache_file):
+    """Memory-map a cached base map and mark it as the most recently used entry"""
+    size, terrain_types, terrain_values = read_terrain_file(cache_file)
+    os.utime(cache_file)
+    return size, terrain_types, terrain_values
+
+
+def store_base_map(cache_file, terrain_types, terrain_values, max_entries=TERRAIN_CACHE_MAX_ENTRIES):
+    """Add a generated base map to the cache, dropping the least recently used entries past the limit"""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    write_terrain_file(cache_file, terrain_types, terrain_values)
+
+    # Reads touch an entry's mtime, so it orders entries by last use
+    entries = sorted(cache_file.parent.glob("*.bin"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+    for stale in entries[max_entries:]:
+        stale.unlink()
@@ -0,0 +1,79 @@
+from constants import *
+
+
+class TerrainTile:
+    """Dict-like view of a single tile stored in the terrain arrays"""
+
+    __slots__ = ("terrain", "x", "y")
+
+    def __init__(self, terrain, x, y):
+        self.terrain = terrain
+        self.x = x
+        self.y = y
+
+    def __getitem__(self, key):
+        if key == "type":
+            return TERRAIN_TYPES[self.terrain.terrain_types[self.y, self.x]]
+        if key == "value":
+            return float(self.terrain.terrain_values[self.y, self.x])
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == "type":
+            self.terrain.set_tile_type(self.x, self.y, value)
+        elif key == "value":
+            self.terrain.terrain_values[self.y, self.x] = value
+        else:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return ("type", "value")
+
+
+class TerrainRow:
+    """View of one row of tiles, indexable by x"""
+
+    __slots__ = ("terrain", "y")
+
+    def __init__(self, terrain, y):
+        self.terrain = terrain
+        self.y = y
+
+    def __len__(self):
+        return self.terrain.size
+
+    def __getitem__(self, x):
+        if not -self.terrain.size <= x < self.terrain.size:
+            raise IndexError(x)
+        return TerrainTile(self.terrain, x % self.terrain.size, self.y)
+
+    def __iter__(self):
+        for x in range(self.terrain.size):
+            yield TerrainTile(self.terrain, x, self.y)
+
+
+class TerrainGrid:
+    """Read-compatible terrain_grid[y][x]["type"] view over the terrain arrays"""
+
+    __slots__ = ("terrain",)
+
+    def __init__(self, terrain):
+        self.terrain = terrain
+
+    def __len__(self):
+        return self.terrain.size
+
+    def __getitem__(self, y):
+        if not -self.terrain.size <= y < self.terrain.size:
+            raise IndexError(y)
+        return TerrainRow(self.terrain, y % self.terrain.size)
+
+    def __iter__(self):
+        for y in range(self.terrain.size):
+            yield TerrainRow(self.terrain, y)
@@ -0,0 +1,68 @@
+import numpy as np
+
+# Gradient table of the improved Perlin noise, projected onto the xy plane
+# (the x and y columns of GRAD3 in the noise library, entry for entry)
+GRADIENTS_X = np.array([1, -1, 1, -1, 1, -1, 1, -1, 0, 0, 0, 0, 1, -1, 0, 0], dtype=np.float64)
+GRADIENTS_Y = np.array([1, 1, -1, -1, 0, 0, 0, 0, 1, -1, 1, -1, 0, 0, -1, 1], dtype=np.float64)
+
+
+def permutation_table(seed):
+    """Build the doubled 512-entry permutation table for a seed.
+
+    The seed shuffles the table, where noise.pnoise2 offsets its fixed table
+    by base. A given seed therefore gives a different map than pnoise2 did."""
+    perm = np.random.RandomState(seed).permutation(256)
+    return np.concatenate([perm, perm])
+
+
+def fade(t):
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+
+def perlin2(x, y, perm, repeat=1024):
+    """Evaluate single-octave 2D Perlin noise for whole arrays of coordinates"""
+    i = np.floor(np.fmod(x, repeat)).astype(np.int64)
+    j = np.floor(np.fmod(y, repeat)).astype(np.int64)
+    ii = np.fmod(i + 1, int(repeat)) & 255
+    jj = np.fmod(j + 1, int(repeat)) & 255
+    i &= 255
+    j &= 255
+
+    x = x - np.floor(x)
+    y = y - np.floor(y)
+    fx = fade(x)
+    fy = fade(y)
+
+    a = perm[i]
+    b = perm[ii]
+    h_aa = perm[perm[a + j]] & 15
+    h_ba = perm[perm[b + j]] & 15
+    h_ab = perm[perm[a + jj]] & 15
+    h_bb = perm[perm[b + jj]] & 15
+
+    g_aa = x * GRADIENTS_X[h_aa] + y * GRADIENTS_Y[h_aa]
+    g_ba = (x - 1) * GRADIENTS_X[h_ba] + y * GRADIENTS_Y[h_ba]
+    g_ab = x * GRADIENTS_X[h_ab] + (y - 1) * GRADIENTS_Y[h_ab]
+    g_bb = (x - 1) * GRADIENTS_X[h_bb] + (y - 1) * GRADIENTS_Y[h_bb]
+
+    bottom = g_aa + fx * (g_ba - g_aa)
+    top = g_ab + fx * (g_bb - g_ab)
+    return bottom + fy * (top - bottom)
+
+
+def fractal_noise(x, y, seed, octaves=4, persistence=0.5, lacunarity=2.0, repeat=1024):
+    """Sum several octaves of Perlin noise, normalised to roughly [-1, 1]"""
+    perm = permutation_table(seed)
+
+    total = np.zeros(np.broadcast(x, y).shape, dtype=np.float64)
+    frequency = 1.0
+    amplitude = 1.0
+    max_amplitude = 0.0
+
+    for _ in range(octaves):
+        total += perlin2(x * frequency, y * frequency, perm, repeat * frequency) * amplitude
+        max_amplitude += amplitude
+        frequency *= lacunarity
+        amplitude *= persistence
+
+    return total / max_amplitude
@@ -0,0 +1,45 @@
+import os
+import numpy as np
+from terrain_format import (HEADER, TERRAIN_FORMAT_VERSION, TERRAIN_MAGIC, read_base_map,
+                            read_terrain_file, store_base_map, values_offset)
+
+
+def make_map(seed):
+    terrain_types = np.full((8, 8), seed % 4, dtype=np.uint8)
+    terrain_values = np.full((8, 8), seed / 10, dtype=np.float32)
+    return terrain_types, terrain_values
+
+
+def test_base_map_cache_evicts_least_recently_used(tmp_path):
+    old_entry = tmp_path / "0.bin"
+    for seed in range(3):
+        store_base_map(tmp_path / f"{seed}.bin", *make_map(seed), max_entries=3)
+    # Backdate the entries so the order does not depend on timestamp resolution
+    for seed in range(3):
+        os.utime(tmp_path / f"{seed}.bin", (1000 + seed, 1000 + seed))
+
+    # The oldest write is read again, which makes it the most recently used
+    _, terrain_types, _ = read_base_map(old_entry)
+    assert (terrain_types == 0).all()
+
+    for seed in range(3, 5):
+        store_base_map(tmp_path / f"{seed}.bin", *make_map(seed), max_entries=3)
+
+    assert sorted(p.name for p in tmp_path.glob("*.bin")) == ["0.bin", "3.bin", "4.bin"]
+
+
+def test_read_terrain_file_honours_header_size(tmp_path):
+    terrain_types, terrain_values = make_map(5)
+    size = terrain_types.shape[0]
+    header_size = HEADER.size + 8
+    path = tmp_path / "wide_header.bin"
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(TERRAIN_MAGIC, TERRAIN_FORMAT_VERSION, header_size, size))
+        f.write(b"\0" * (header_size - HEADER.size))
+        f.write(terrain_types.tobytes())
+        f.write(b"\0" * (values_offset(size, header_size) - header_size - size * size))
+        f.write(terrain_values.astype("<f4").tobytes())
+
+    _, read_types, read_values = read_terrain_file(path)
+    assert (read_types == terrain_types).all()
+    assert (read_values == terrain_values).all()
@@ -3,22 +3,28 @@ import random
 import math
 from constants import *
 from utils import distance
+from sprite_cache import sprite_cache, circle_sprite
 
 class Tourist(pygame.sprite.Sprite):
     def __init__(self, position, economy_manager):
         super().__init__()
         
-        size = int(TILE_SIZE * 0.8)
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, PINK, (size//2, size//2), size//2)
+        self.manager = economy_manager
+        self.terrain = economy_manager.terrain
+        self.game_state = economy_manager.game_state
         
+        self.color = PINK
         self.rect = self.image.get_rect()
+        
+        self.reset(position)
+    
+    def reset(self, position):
+        """Start a fresh visit at position (pooled tourists are recycled through here)"""
+        self.color = PINK
         self.rect.center = position
         
         self.position = position
-        self.manager = economy_manager
-        self.terrain = economy_manager.terrain
-        self.game_state = economy_manager.game_state
+        self.previous_position = position
         
         self.speed = random.uniform(2.0, 4.0) * (TILE_SIZE / 32)
         self.satisfaction = random.uniform(50, 70)
@@ -30,9 +36,16 @@ class Tourist(pygame.sprite.Sprite):
         self.path = []
         self.path_index = 0
         self.waiting_time = 0
+        self.pending_position = None
+        self.lod_elapsed = 0.0
+    
+    @property
+    def image(self):
+        return sprite_cache.get(("tourist", self.color), circle_sprite, self.color, int(TILE_SIZE * 0.8))
     
     def step(self, dt):
         """Update tourist behavior"""
+        self.previous_position = self.position
         self.time_spent += dt / 60
         
         self.update_satisfaction(dt)
@@ -52,8 +65,7 @@ class Tourist(pygame.sprite.Sprite):
         """Update satisfaction based on surroundings"""
         self.satisfaction -= 0.5 * dt / 60
         
-        nearby_animals = [a for a in self.manager.animals.animals 
-                          if distance(self.position, a.position) < TILE_SIZE * 10]
+        nearby_animals = self.manager.animals.index.query_radius(self.position, TILE_SIZE * 10)
         
         if nearby_animals:
             species_seen = set(a.species for a in nearby_animals)
@@ -63,11 +75,9 @@ class Tourist(pygame.sprite.Sprite):
                 if animal.species == "elephant" or animal.species == "lion":
                     self.satisfaction += 1 * dt / 60
         
-        nearby_buildings = [b for b in self.manager.buildings.buildings 
-                           if distance(self.position, b.position) < TILE_SIZE * 3]
-        
-        on_path = any(b.building_type == "path" for b in nearby_buildings)
-        at_platform = any(b.building_type == "viewing_platform" for b in nearby_buildings)
+        amenities = self.manager.buildings.amenities
+        on_path = amenities.near("path", self.position)
+        at_platform = amenities.near("viewing_platform", self.position)
         
         if on_path:
             self.satisfaction += 0.2 * dt / 60
@@ -80,17 +90,13 @@ class Tourist(pygame.sprite.Sprite):
         self.satisfaction = max(0, min(100, self.satisfaction))
         
         if self.satisfaction > 80:
-            color = GREEN
+            self.color = GREEN
         elif self.satisfaction > 50:
-            color = YELLOW
+            self.color = YELLOW
         elif self.satisfaction > 30:
-            color = ORANGE
+            self.color = ORANGE
         else:
-            color = RED
-            
-        size = int(TILE_SIZE * 0.8)
-        self.image = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, color, (size//2, size//2), size//2)
+            self.color = RED
     
     def move(self, dt):
         """Move around the park"""
@@ -124,11 +130,20 @@ class Tourist(pygame.sprite.Sprite):
         speed = self.speed * dt
         move_x = direction_x * speed
         move_y = direction_y * speed
-        new_pos = (self.position[0] + move_x, self.position[1] + move_y)
+        # The manager checks every proposed move against the water in one batch
+        self.pending_position = (self.position[0] + move_x, self.position[1] + move_y)
+
+    def apply_move(self, into_water):
+        """Commit the move proposed by move unless it would step into water"""
+        new_pos = self.pending_position
+        self.pending_position = None
 
-        if not self.terrain.is_water_at_position(new_pos):
-            self.position = new_pos
-            self.rect.center = self.position
+        if into_water:
+            return False
+
+        self.position = new_pos
+        self.rect.center = self.position
+        return True
 
     
     def choose_new_target(self):
@@ -145,15 +160,12 @@ class Tourist(pygame.sprite.Sprite):
             else:
                 self.path = []
 
-        paths = [b for b in self.manager.buildings.buildings 
-                if b.building_type == "path"]
-        platforms = [b for b in self.manager.buildings.buildings 
-                    if b.building_type == "viewing_platform"]
+        paths = self.terrain.paths.positions
+        platforms = self.manager.buildings.types.of_type("viewing_platform")
         animals = self.manager.animals.animals
 
         if random.random() < 0.7 and paths:
-            target = random.choice(paths)
-            self.target_position = target.position
+            self.target_position = random.choice(paths)
         elif random.random() < 0.8 and platforms:
             target = random.choice(platforms)
             self.target_position = target.position
@@ -178,9 +190,7 @@ class Tourist(pygame.sprite.Sprite):
     
     def leave(self):
         """Tourist leaves the park"""
-        if self in self.manager.tourists:
-            self.manager.tourists.remove(self)
-            self.manager.tourists_group.remove(self)
-        
         review_score = max(1, min(5, int(self.satisfaction / 20)))
+        
+        self.manager.remove_tourist(self)
         self.manager.add_review(review_score)
@@ -0,0 +1,46 @@
+import numpy as np
+from constants import *
+
+
+class TouristArrivals:
+    """Poisson arrival process for tourists at the park entrance.
+
+    The base rate (tourists per second of game time at full attractiveness)
+    is TOURIST_DAY_RATE during opening hours and TOURIST_NIGHT_RATE outside
+    them. The expected number of arrivals in a tick is the rate integrated
+    over the game hours the tick covers, so ticks of any length, and ones
+    that straddle opening or closing time, see the same throughput."""
+
+    def __init__(self, day_rate=TOURIST_DAY_RATE, night_rate=TOURIST_NIGHT_RATE,
+                 opening_hours=TOURIST_OPENING_HOURS, seed=None):
+        self.day_rate = day_rate
+        self.night_rate = night_rate
+        self.opening, self.closing = opening_hours
+        self.rng = np.random.default_rng(seed)
+        self.arrivals = 0
+
+    def open_hours_between(self, start_hour, hours):
+        """How many of the hours from start_hour onwards fall within opening hours"""
+        start = start_hour % 24
+        end = start + hours
+        total = 0.0
+        day = 0
+        while day * 24 < end:
+            total += max(0.0, min(end, day * 24 + self.closing) - max(start, day * 24 + self.opening))
+            day += 1
+        return total
+
+    def expected(self, hour, dt):
+        """Expected arrivals at full attractiveness over dt seconds starting at hour"""
+        hours = dt * GAME_HOURS_PER_SECOND
+        open_seconds = self.open_hours_between(hour, hours) / GAME_HOURS_PER_SECOND
+        return self.day_rate * open_seconds + self.night_rate * (dt - open_seconds)
+
+    def sample(self, hour, dt, attractiveness):
+        """Number of tourists arriving in a tick"""
+        rate = self.expected(hour, dt) * attractiveness
+        if rate <= 0:
+            return 0
+        count = int(self.rng.poisson(rate))
+        self.arrivals += count
+        return count
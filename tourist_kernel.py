@@ -0,0 +1,284 @@
+import random
+import numpy as np
+from tourist import Tourist
+from amenity_rasters import disk_sum
+from animal_kernel import kernel_scalar, kernel_point
+from constants import *
+
+# Sprite colours by satisfaction band; new tourists are pink until their first step
+TOURIST_COLORS = (PINK, RED, ORANGE, YELLOW, GREEN)
+
+# Species that please tourists beyond just being seen
+STAR_SPECIES = ("elephant", "lion")
+
+# Per-tourist columns of the kernel and their dtypes
+SCALAR_FIELDS = {
+    "speed": np.float64,
+    "satisfaction": np.float64,
+    "spending_rate": np.float64,
+    "visit_duration": np.float64,
+    "time_spent": np.float64,
+    "waiting_time": np.float64,
+    "path_index": np.int64,
+    "route_length": np.int64,
+    "has_target": np.bool_,
+    "color_code": np.int8,
+    "lod_elapsed": np.float64,
+    "cell_x": np.int64,
+    "cell_y": np.int64,
+}
+VECTOR_FIELDS = ("position", "previous_position", "target_position", "waypoint")
+
+
+class TouristKernel:
+    """Structure-of-arrays store that advances every tourist per tick with vectorized operations.
+
+    Satisfaction, spending and visit time are updated for the whole crowd at
+    once. Per-tourist Python only runs for the few tourists that reach a
+    waypoint or need a new target on a tick."""
+
+    def __init__(self, economy_manager, capacity=64):
+        self.manager = economy_manager
+        self.terrain = economy_manager.terrain
+        self.game_state = economy_manager.game_state
+        self.count = 0
+        self.capacity = 0
+        self.views = []
+        self.routes = []
+        self.coverage = None
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        """Reallocate every column with room for capacity tourists"""
+        for name, dtype in SCALAR_FIELDS.items():
+            column = np.zeros(capacity, dtype=dtype)
+            if self.capacity:
+                column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+        for name in VECTOR_FIELDS:
+            column = np.zeros((capacity, 2), dtype=np.float64)
+            if self.capacity:
+                column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def allocate(self, view):
+        """Reserve the next free slot for a tourist view"""
+        if self.count == self.capacity:
+            self.grow(self.capacity * 2)
+        slot = self.count
+        for name in (*SCALAR_FIELDS, *VECTOR_FIELDS):
+            getattr(self, name)[slot] = 0
+        self.count += 1
+        self.views.append(view)
+        self.routes.append([])
+        return slot
+
+    def release(self, view):
+        """Free a view's slot by moving the last tourist into it"""
+        slot = view.slot
+        last = self.count - 1
+        if slot != last:
+            for name in (*SCALAR_FIELDS, *VECTOR_FIELDS):
+                column = getattr(self, name)
+                column[slot] = column[last]
+            moved = self.views[last]
+            moved.slot = slot
+            self.views[slot] = moved
+            self.routes[slot] = self.routes[last]
+        self.views.pop()
+        self.routes.pop()
+        self.count = last
+        view.slot = None
+
+    def update_animal_coverage(self):
+        """Count, for every tile, the animals of each species within TOURIST_VIEW_RADIUS tiles"""
+        animals = self.manager.animals
+        codes, tiles = animals.species_tiles()
+        species = len(animals.species_config)
+        size = self.terrain.size
+        counts = np.bincount(codes * size * size + tiles, minlength=species * size * size)
+        coverage = disk_sum(counts.reshape(species, size, size), TOURIST_VIEW_RADIUS)
+
+        star_codes = [code for code, name in enumerate(animals.species_config) if name in STAR_SPECIES]
+        self.coverage = ((coverage > 0).sum(axis=0).ravel(), coverage[star_codes].sum(axis=0).ravel())
+
+    def step(self, dt):
+        """Advance satisfaction, movement and visit time; return the views whose visit is over.
+
+        dt is either one value for every tourist or an array with one value per
+        slot, where 0 skips that tourist for this tick."""
+        n = self.count
+        if not n:
+            return []
+
+        dt = np.broadcast_to(np.asarray(dt, dtype=np.float64), (n,))
+        active = dt > 0
+        minutes = dt / 60
+
+        self.previous_position[:n] = self.position[:n]
+        time_spent = self.time_spent[:n]
+        time_spent += minutes
+
+        self.update_satisfaction(n, active, minutes)
+
+        leaving = active & (time_spent >= self.visit_duration[:n])
+        self.move(n, active & ~leaving, dt)
+
+        # Everyone whose visit clock passed a whole minute spends, in one transfer
+        spending = active & (time_spent % 1.0 < minutes)
+        if spending.any():
+            amounts = self.spending_rate[:n][spending] * (self.satisfaction[:n][spending] / 50)
+            self.game_state.add_funds(float(amounts.sum()))
+
+        return [self.views[slot] for slot in np.flatnonzero(leaving)]
+
+    def update_satisfaction(self, n, active, minutes):
+        """Vectorized Tourist.update_satisfaction, reading the surroundings from tile rasters"""
+        if self.coverage is None:
+            self.update_animal_coverage()
+        species_seen, stars = self.coverage
+        amenities = self.manager.buildings.amenities
+        tiles = self.terrain.grid_indices_at(self.position[:n])
+
+        on_path = amenities.rasters["path"].ravel()[tiles] > 0
+        at_platform = amenities.rasters["viewing_platform"].ravel()[tiles] > 0
+
+        change = (-0.5 + species_seen[tiles] * 2 + stars[tiles]
+                  + np.where(on_path, 0.2, -1.0) + np.where(at_platform, 2.0, 0))
+        satisfaction = self.satisfaction[:n]
+        satisfaction += change * minutes
+        np.clip(satisfaction, 0, 100, out=satisfaction)
+
+        bands = 1 + (satisfaction > 30).astype(np.int8) + (satisfaction > 50) + (satisfaction > 80)
+        self.color_code[:n] = np.where(active, bands, self.color_code[:n])
+
+    def move(self, n, moving, dt):
+        """Vectorized Tourist.move: wait, follow the route, pick new targets, then walk"""
+        waiting = np.flatnonzero(moving & (self.waiting_time[:n] > 0))
+        self.waiting_time[waiting] -= dt[waiting]
+        moving[waiting] = False
+
+        # Tourists on a route always head for its current waypoint
+        on_route = moving & (self.path_index[:n] < self.route_length[:n])
+        self.target_position[:n][on_route] = self.waypoint[:n][on_route]
+        self.has_target[:n] |= on_route
+
+        offset = self.target_position[:n] - self.position[:n]
+        length = np.hypot(offset[:, 0], offset[:, 1])
+
+        for slot in np.flatnonzero(on_route & (length < TILE_SIZE / 2)).tolist():
+            view = self.views[slot]
+            view.path_index += 1
+            if view.path_index >= len(view.path):
+                view.path = []
+                view.target_position = None
+                view.waiting_time = random.uniform(5, 20)
+                moving[slot] = False
+
+        for slot in np.flatnonzero(moving & (~self.has_target[:n] | (length < TILE_SIZE))).tolist():
+            view = self.views[slot]
+            view.choose_new_target()
+            view.waiting_time = random.uniform(5, 20)
+            moving[slot] = False
+
+        slots = np.flatnonzero(moving & (length > 0))
+        if not slots.size:
+            return
+
+        direction = offset[slots] / length[slots, None]
+        new_positions = self.position[slots] + direction * (self.speed[slots] * dt[slots])[:, None]
+        allowed = ~self.terrain.is_water_batch(new_positions)
+        self.position[slots[allowed]] = new_positions[allowed]
+
+    def tourists_at_tile(self, tile):
+        """Views of the tourists standing on a grid tile"""
+        n = self.count
+        tiles = self.terrain.grid_indices_at(self.position[:n])
+        return [self.views[slot] for slot in np.flatnonzero(tiles == tile[1] * self.terrain.size + tile[0])]
+
+    def sync_index(self, index):
+        """Move the tourists that changed cell in a SpatialHash"""
+        n = self.count
+        cells = np.floor(self.position[:n] / index.cell_size).astype(np.int64)
+        changed = (cells[:, 0] != self.cell_x[:n]) | (cells[:, 1] != self.cell_y[:n])
+        for slot in np.flatnonzero(changed).tolist():
+            index.move(self.views[slot])
+        self.cell_x[:n] = cells[:, 0]
+        self.cell_y[:n] = cells[:, 1]
+
+    def visible(self, camera_offset, margin=50):
+        """Views of the tourists whose position falls inside the padded viewport"""
+        n = self.count
+        screen = self.position[:n] - camera_offset
+        inside = ((screen[:, 0] >= -margin) & (screen[:, 0] <= SCREEN_WIDTH + margin) &
+                  (screen[:, 1] >= -margin) & (screen[:, 1] <= SCREEN_HEIGHT + margin))
+        return [self.views[slot] for slot in np.flatnonzero(inside)]
+
+
+class KernelTourist(Tourist):
+    """Tourist whose simulation state lives in a TouristKernel slot"""
+
+    speed = kernel_scalar("speed")
+    satisfaction = kernel_scalar("satisfaction")
+    spending_rate = kernel_scalar("spending_rate")
+    visit_duration = kernel_scalar("visit_duration")
+    time_spent = kernel_scalar("time_spent")
+    waiting_time = kernel_scalar("waiting_time")
+    lod_elapsed = kernel_scalar("lod_elapsed")
+    position = kernel_point("position")
+    previous_position = kernel_point("previous_position")
+    target_position = kernel_point("target_position", "has_target")
+
+    def __init__(self, position, economy_manager):
+        self.kernel = economy_manager.kernel
+        self.slot = self.kernel.allocate(self)
+        super().__init__(position, economy_manager)
+    
+    def reset(self, position):
+        # A recycled view needs a new slot; its old one was released when it left
+        if self.slot is None:
+            self.slot = self.kernel.allocate(self)
+        super().reset(position)
+
+    @property
+    def color(self):
+        return TOURIST_COLORS[self.kernel.color_code[self.slot]]
+
+    @color.setter
+    def color(self, value):
+        self.kernel.color_code[self.slot] = TOURIST_COLORS.index(value)
+
+    @property
+    def path(self):
+        return self.kernel.routes[self.slot]
+
+    @path.setter
+    def path(self, value):
+        self.kernel.routes[self.slot] = value
+        self.kernel.route_length[self.slot] = len(value)
+        self.sync_waypoint()
+
+    @property
+    def path_index(self):
+        return self.kernel.path_index[self.slot].item()
+
+    @path_index.setter
+    def path_index(self, value):
+        self.kernel.path_index[self.slot] = value
+        self.sync_waypoint()
+
+    def sync_waypoint(self):
+        route = self.kernel.routes[self.slot]
+        index = self.kernel.path_index[self.slot]
+        if index < len(route):
+            self.kernel.waypoint[self.slot] = route[index]
+
+    @property
+    def rect(self):
+        self.sprite_rect.center = self.position
+        return self.sprite_rect
+
+    @rect.setter
+    def rect(self, value):
+        self.sprite_rect = value
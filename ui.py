@@ -4,8 +4,8 @@ import sys
 import subprocess
 from constants import *
 from components import Button
-from utils      import distance
 from game_state import GameSpeed
+from sprite_cache import sprite_cache, filled_sprite
 
 class UIManager:
     def __init__(self, game_state, animal_manager, building_manager, economy_manager, terrain):
@@ -20,6 +20,9 @@ class UIManager:
         self.animal_overview_active = False
         self.pause_menu_active      = False
         self.close_button = None
+        # Placement check for the last snapped footprint the preview was drawn at
+        self.preview_key   = None
+        self.preview_valid = False
 
         self.build_buttons = []
         self.time_buttons  = []
@@ -105,7 +108,7 @@ class UIManager:
         self.game_state.save_game()
         self.animal_manager.save_animals()
         self.building_manager.save_buildings()
-        self.terrain.save_terrain()
+        self.terrain.save_world()
 
         subprocess.Popen([sys.executable, "main_menu.py"])
         pygame.quit()
@@ -256,22 +259,7 @@ class UIManager:
                                     action=self.toggle_animal_overview)
             self.close_button.draw(screen)
 
-            species_stats = {}
-            for species in self.animal_manager.species_config:
-                group = [a for a in self.animal_manager.animals if a.species == species]
-                pop = len(group)
-                if pop:
-                    avg_health = sum(a.health for a in group) / pop
-                    avg_hunger = sum(a.hunger for a in group) / pop
-                    avg_thirst = sum(a.thirst for a in group) / pop
-                else:
-                    avg_health = avg_hunger = avg_thirst = 0
-                species_stats[species] = {
-                    "population": pop,
-                    "avg_health": avg_health,
-                    "avg_hunger": avg_hunger,
-                    "avg_thirst": avg_thirst
-                }
+            species_stats = self.animal_manager.stats.species_stats()
             
             y_pos = panel_y + 50
             spacing = 30
@@ -324,19 +312,23 @@ class UIManager:
         width = int(config['scale'][0] * TILE_SIZE)
         height = int(config['scale'][1] * TILE_SIZE)
         
-        preview = pygame.Surface((width, height), pygame.SRCALPHA)
+        preview = sprite_cache.get(("preview", self.selected_building), filled_sprite,
+                                   (*config['color'][:3], 150), (width, height))
         
-        color_with_alpha = (*config['color'][:3], 150)
-        preview.fill(color_with_alpha)
-        
-        screen_pos = (mouse_pos[0] - width // 2, mouse_pos[1] - height // 2)
+        # Draw where the building would actually go, snapped to the grid
+        footprint = self.building_manager.footprint(self.selected_building, world_pos)
+        center = self.building_manager.footprint_center(footprint)
+        screen_pos = (center[0] - camera_offset[0] - width // 2, center[1] - camera_offset[1] - height // 2)
         
         screen.blit(preview, screen_pos)
         
-        valid_position = (self.building_manager.terrain.is_suitable_for_building(world_pos) and
-                        not self.building_manager.is_position_occupied(world_pos))
+        key = (self.selected_building, footprint, self.building_manager.occupancy_version)
+        if key != self.preview_key:
+            self.preview_key = key
+            self.preview_valid = (self.building_manager.is_footprint_buildable(footprint) and
+                                  self.building_manager.is_footprint_free(footprint))
         
-        indicator_color = GREEN if valid_position else RED
+        indicator_color = GREEN if self.preview_valid else RED
         pygame.draw.rect(screen, indicator_color, (screen_pos[0], screen_pos[1], width, height), 2)
     
     def draw_cursor_info(self, screen, camera_offset, mouse_pos):
@@ -349,18 +341,16 @@ class UIManager:
         
         info_text = f"Terrain: {terrain_type.capitalize()}"
         
-        for building in self.building_manager.buildings:
-            if distance(building.position, world_pos) < TILE_SIZE:
-                if hasattr(building, "health"):
-                    info_text += f" | {building.building_type.capitalize()} (Health: {building.health:.0f}%)"
-                else:
-                    info_text += f" | {building.building_type.capitalize()}"
-                break
+        building = self.building_manager.index.pick(world_pos)
+        if building:
+            if hasattr(building, "health"):
+                info_text += f" | {building.building_type.capitalize()} (Health: {building.health:.0f}%)"
+            else:
+                info_text += f" | {building.building_type.capitalize()}"
 
-        for animal in self.animal_manager.animals:
-            if distance(animal.position, world_pos) < TILE_SIZE:
-                info_text += f" | {animal.species.capitalize()} (H:{animal.health:.0f}% F:{animal.hunger:.0f}% W:{animal.thirst:.0f}%)"
-                break
+        animal = self.animal_manager.index.pick(world_pos)
+        if animal:
+            info_text += f" | {animal.species.capitalize()} (H:{animal.health:.0f}% F:{animal.hunger:.0f}% W:{animal.thirst:.0f}%)"
         
         info_surface = self.small_font.render(info_text, True, WHITE)
         screen.blit(info_surface, (10, SCREEN_HEIGHT - 20))
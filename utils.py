@@ -3,6 +3,11 @@ import math
 def distance(pos1, pos2):
     return math.sqrt((pos1[0] - pos2[0])**2 + (pos1[1] - pos2[1])**2)
 
+def lerp_position(previous, current, alpha):
+    """Point a fraction alpha of the way from previous to current"""
+    return (previous[0] + (current[0] - previous[0]) * alpha,
+            previous[1] + (current[1] - previous[1]) * alpha)
+
 def lerp_color(color1, color2, t):
     """Linear interpolation between two colors"""
     r = int(color1[0] + (color2[0] - color1[0]) * t)
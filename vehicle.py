@@ -1,5 +1,6 @@
 import pygame, math, random
 from constants import *
+from utils import lerp_position
 
 class Jeep(pygame.sprite.Sprite):
     def __init__(self, terrain, economy_manager):
@@ -20,18 +21,18 @@ class Jeep(pygame.sprite.Sprite):
 
         ex, ey = terrain.grid_to_world(terrain.entrance_tile)
         self.position = (ex, ey)
+        self.previous_position = self.position
         self.rect.center = self.position
         self.speed = 3.0 * (TILE_SIZE/32)
 
     def update(self, dt):
+        self.previous_position = self.position
         if self.state == "idle":
-            waiting = [t for t in self.econ.tourists 
-                       if self.terrain.world_to_grid(t.position)==self.terrain.entrance_tile]
+            waiting = self.econ.tourists_at_tile(self.terrain.entrance_tile)
             if waiting:
                 for t in waiting[:self.capacity]:
                     self.passengers.append(t)
-                    self.econ.tourists.remove(t)
-                    self.econ.tourists_group.remove(t)
+                    self.econ.remove_tourist(t)
                 route = self.terrain.find_path(
                     self.terrain.entrance_tile,
                     self.terrain.exit_tile
@@ -110,10 +111,11 @@ class VehicleManager:
         for v in self.vehicles:
             v.update(dt)
 
-    def render(self, screen, camera_offset):
+    def render(self, screen, camera_offset, alpha=1.0):
         for v in self.vehicles:
-            sx = v.position[0] - camera_offset[0]
-            sy = v.position[1] - camera_offset[1]
+            position = lerp_position(v.previous_position, v.position, alpha)
+            sx = position[0] - camera_offset[0]
+            sy = position[1] - camera_offset[1]
             if -100 < sx < SCREEN_WIDTH+100 and -100 < sy < SCREEN_HEIGHT+100:
                 rect = v.image.get_rect(center=(sx,sy))
                 screen.blit(v.image, rect)